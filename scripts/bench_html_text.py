@@ -0,0 +1,61 @@
+import html
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.html_text import StatusTextCache, html_to_text
+
+# Status HTML in the shape Mastodon 4.x serves it: paragraphs, line breaks,
+# h-card mentions, hashtag links and link previews split into invisible spans
+CORPUS = [
+    '<p>Just shipped a new release of our open source library! Faster builds, fewer bugs and a brand new plugin API</p><p><a href="https://mastodon.social/tags/python" class="mention hashtag" rel="tag">#<span>python</span></a> <a href="https://mastodon.social/tags/opensource" class="mention hashtag" rel="tag">#<span>opensource</span></a></p>',
+    '<p><span class="h-card" translate="no"><a href="https://fosstodon.org/@alice" class="u-url mention">@<span>alice</span></a></span> <span class="h-card" translate="no"><a href="https://hachyderm.io/@bob" class="u-url mention">@<span>bob</span></a></span> that&#39;s exactly what I said &amp; nobody listened 😅</p>',
+    '<p>Wrote up how we cut our CI time in half:<br /><a href="https://blog.example.com/posts/2024/ci-speedups" target="_blank" rel="nofollow noopener noreferrer" translate="no"><span class="invisible">https://</span><span class="ellipsis">blog.example.com/posts/2024/ci</span><span class="invisible">-speedups</span></a></p><p>Feedback welcome!</p>',
+    '<p>Hot take: tabs are better than spaces and I&#39;m not taking questions</p>',
+    '<p>The northern lights were absolutely unreal tonight.<br />Stayed out until 2am taking photos<br /><br /><a href="https://photog.social/tags/aurora" class="mention hashtag" rel="tag">#<span>aurora</span></a> <a href="https://photog.social/tags/photography" class="mention hashtag" rel="tag">#<span>photography</span></a> <a href="https://photog.social/tags/nature" class="mention hashtag" rel="tag">#<span>nature</span></a></p>',
+    '<p>Reading about the history of the printing press &quot;and how it changed the way ideas spread&quot; across Europe. Highly recommend <a href="https://www.example.org/books/printing-press" target="_blank" rel="nofollow noopener noreferrer" translate="no"><span class="invisible">https://www.</span><span class="ellipsis">example.org/books/printing-pre</span><span class="invisible">ss</span></a></p>',
+]
+
+def old_clean_html(text):
+    clean_text = re.sub(r'<[^>]+>', '', text)
+    clean_text = re.sub(r'http\S+|www.\S+', '', clean_text)
+    clean_text = ' '.join(clean_text.split())
+    return clean_text
+
+def old_clean_html_unescaped(text):
+    # The previous chain plus the entity decoding it was missing
+    return html.unescape(old_clean_html(text))
+
+def bench(candidates, iterations, repeat=7):
+    """Best-of-N µs per status for each candidate, runs interleaved to spread scheduler noise"""
+    best = {name: float('inf') for name, _, _ in candidates}
+    for _ in range(repeat):
+        for name, func, corpus in candidates:
+            def run():
+                for status in corpus:
+                    func(status)
+            elapsed = timeit.timeit(run, number=iterations)
+            best[name] = min(best[name], elapsed / (iterations * len(corpus)) * 1e6)
+    for name, per_status in best.items():
+        print(f"{name:<40} {per_status:8.2f} µs/status")
+    return best
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"HTML to text over {iterations * len(CORPUS)} statuses")
+    cache = StatusTextCache()
+    statuses = [{'id': str(i), 'content': content} for i, content in enumerate(CORPUS)]
+    results = bench([
+        ("regex chain (previous _clean_html)", old_clean_html, CORPUS),
+        ("regex chain + html.unescape", old_clean_html_unescaped, CORPUS),
+        ("html_to_text", html_to_text, CORPUS),
+        ("StatusTextCache (warm)", cache.get, statuses),
+    ], iterations)
+    # Cold conversion lands within run-to-run noise of the old chain (it buys
+    # correct entity decoding, not speed); the win is parsing once per status
+    old = results['regex chain (previous _clean_html)']
+    print(f"html_to_text vs regex chain: {old / results['html_to_text']:.2f}x (parity), "
+          f"cached by status ID: {old / results['StatusTextCache (warm)']:.1f}x")
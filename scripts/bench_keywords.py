@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.text import extract_keywords
+
+SAMPLE_STATUSES = [
+    "Just shipped a new release of our open source library! Faster builds, fewer bugs and a brand new plugin API #python #opensource",
+    "Does anyone know why my sourdough keeps collapsing in the oven? I've tried everything at this point 😩",
+    "The northern lights were absolutely unreal tonight. Stayed out until 2am taking photos #aurora #photography",
+    "Hot take: tabs are better than spaces and I'm not taking questions",
+    "Reading about the history of the printing press and how it changed the way ideas spread across Europe",
+]
+
+def bench(name, func, iterations):
+    started = time.perf_counter()
+    func(iterations)
+    elapsed = time.perf_counter() - started
+    per_status = elapsed / (iterations * len(SAMPLE_STATUSES)) * 1e6
+    print(f"{name:<28} {per_status:8.2f} µs/status")
+
+def run_single(iterations):
+    for _ in range(iterations):
+        for text in SAMPLE_STATUSES:
+            extract_keywords(text)
+
+def run_nltk(iterations):
+    from nltk.tokenize import word_tokenize
+    from nltk.corpus import stopwords
+    for _ in range(iterations):
+        for text in SAMPLE_STATUSES:
+            tokens = word_tokenize(text.lower())
+            stop_words = set(stopwords.words('english'))
+            [word for word in tokens if word.isalnum() and word not in stop_words][:5]
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"Keyword extraction over {iterations * len(SAMPLE_STATUSES)} statuses")
+    bench("extract_keywords", run_single, iterations)
+    try:
+        bench("nltk (previous _format_post)", run_nltk, max(iterations // 10, 1))
+    except (ImportError, LookupError):
+        print("nltk baseline skipped: nltk or its punkt/stopwords data is not installed")
@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent.llm_backend import create_llm_backend
+from src.platforms.mastodon import MastodonPlatform
+
+# Simulated Gemini: ~1.2s lognormal latency, 2% rate limited, 1% server errors
+BACKEND_SETTINGS = {
+    'latency': {'distribution': 'lognormal', 'mean': 1.2, 'sigma': 0.6, 'max': 20.0},
+    'rate_limit_rate': 0.02,
+    'error_rate': 0.01,
+    'retry_after': 5.0,
+    'seed': 42
+}
+
+CREDENTIALS = {
+    'client_id': 'bench', 'client_secret': 'bench', 'access_token': 'bench',
+    'instance_url': 'https://mastodon.invalid', 'gemini_api_key': 'unused'
+}
+
+async def run(platform, requests: int):
+    async def mention(i):
+        return await platform.generate_entertainment_response(f"Mention number {i} about python", service='mentions')
+
+    async def dm(i):
+        return await platform.generate_styled_post(f"Reply to @user{i}: what's new?", retry='reply', service='dm')
+
+    async def trends(i):
+        return await platform.chat.send_message(f"What is trending right now? ({i})")
+
+    kinds = [mention, dm, trends]
+    started = time.perf_counter()
+    results = await asyncio.gather(*(kinds[i % 3](i) for i in range(requests)), return_exceptions=True)
+    return time.perf_counter() - started, sum(isinstance(result, Exception) for result in results)
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    speedup = float(sys.argv[2]) if len(sys.argv) > 2 else 1000.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        backend = create_llm_backend('fake', speedup=speedup, **BACKEND_SETTINGS)
+        platform = MastodonPlatform(CREDENTIALS, llm_backend=backend)
+        # Budgets and retry backoff are wall-clock settings; scale them with the simulation
+        platform.update_settings('tokens', {
+            service: {'hourly': 10 ** 9, 'daily': 10 ** 9} for service in ('mentions', 'dm', 'auto_post')
+        })
+        platform.update_settings('retry', {
+            name: {'base_delay': 1.0 / speedup, 'max_delay': 60.0 / speedup, 'max_total_delay': 120.0 / speedup}
+            for name in ('reply', 'post')
+        })
+        platform.llm.retry = platform.retry_policies['post']
+
+        elapsed, failed = asyncio.run(run(platform, requests))
+        status = platform.get_service_status()
+        pool, fake = status['llm'], status['llm_backend']
+        print(f"{requests} requests in {elapsed:.2f}s at {speedup:g}x "
+              f"({requests / elapsed:.0f} req/s simulated, {requests / elapsed / speedup * 3600:.0f} req/h real time)")
+        print(f"model calls: {fake['calls']} ({fake['rate_limited']} rate limited, {fake['errors']} errors), "
+              f"failed requests: {failed}")
+        print(f"pool: max_in_flight={pool['max_in_flight']} latency p50={pool['latency_p50']}s "
+              f"p95={pool['latency_p95']}s (scaled)")
+        print(f"retries: {sum(policy['retries'] for policy in status['llm_retries'].values())}, "
+              f"chat context: {status['chat']['last_context_tokens']} tokens")
+        platform.state.close()
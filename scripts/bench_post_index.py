@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.minhash import MinHashIndex
+from src.utils.state_store import StateStore
+
+VOCABULARY = [f"word{i}" for i in range(3000)] + ["🚀", "#tech", "#ai", "#python", "today", "new"]
+
+def make_post(rng):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(20, 35)))
+
+def jaccard(text1, text2):
+    words1, words2 = set(text1.lower().split()), set(text2.lower().split())
+    return len(words1 & words2) / len(words1 | words2)
+
+def near_copy(rng, text, keep):
+    words = text.split()
+    return ' '.join(word if rng.random() < keep else rng.choice(VOCABULARY) for word in words)
+
+if __name__ == "__main__":
+    history_size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(7)
+    history = [make_post(rng) for _ in range(history_size)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = StateStore(os.path.join(tmp, "bench_state.db"))
+        index = MinHashIndex(state)
+        started = time.perf_counter()
+        index.update(history)
+        print(f"Indexed {history_size} posts in {time.perf_counter() - started:.2f}s")
+
+        fresh = [make_post(rng) for _ in range(500)]
+        copies = [near_copy(rng, rng.choice(history), 0.92) for _ in range(500)]
+        for name, queries in (("fresh posts", fresh), ("near-duplicates", copies)):
+            started = time.perf_counter()
+            flagged = sum(index.is_duplicate(text) for text in queries)
+            per_query = (time.perf_counter() - started) / len(queries) * 1e3
+            print(f"{name:<16} {per_query:.3f} ms/query, flagged {flagged}/{len(queries)}")
+
+        started = time.perf_counter()
+        for text in copies[:20]:
+            any(jaccard(text, past) > index.threshold for past in history)
+        per_query = (time.perf_counter() - started) / 20 * 1e3
+        print(f"{'linear Jaccard':<16} {per_query:.3f} ms/query over the same history")
+
+        state.close()
+        reloaded = StateStore(os.path.join(tmp, "bench_state.db"))
+        started = time.perf_counter()
+        index = MinHashIndex(reloaded)
+        print(f"Reloaded {len(index)} signatures in {time.perf_counter() - started:.2f}s")
+        reloaded.close()
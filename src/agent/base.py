@@ -26,9 +26,9 @@ class TwitterAIAgent:
 
             # Generate and post reply
             if self._has_image(parent_tweet.data):
-                result = self.handlers.handle_image_analysis(parent_tweet.data)
+                result = await self.handlers.handle_image_analysis(parent_tweet.data)
             else:
-                result = self.handlers.handle_research(parent_tweet.data)
+                result = await self.handlers.handle_research(parent_tweet.data)
             return {"response": result}
         except Exception as e:
             return {"error": str(e)}
@@ -0,0 +1,119 @@
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from src.agent.structured_output import StyledPost
+
+class Draft:
+    """A generated scheduled post waiting to be published"""
+
+    def __init__(self, post: StyledPost, text: str, topics: List[str], style: str, signature: tuple):
+        self.post = post
+        self.text = text
+        self.topics = list(topics)
+        self.style = style
+        self.signature = signature
+        self.created = time.time()
+
+    def age(self) -> float:
+        return time.time() - self.created
+
+class DraftPool:
+    """Scheduled posts generated ahead of their publish time.
+
+    Drafts are kept in generation order and expire after ``max_age``
+    seconds, or earlier when none of the trending topics they were written
+    about are still trending or the post style has changed since. ``index``
+    is the published-post ``MinHashIndex``: a draft that is a near-duplicate
+    of a published post or of another draft is never taken or added.
+    """
+
+    def __init__(self, index, size: int = 2, max_age: float = 3600.0):
+        self.index = index
+        self.size = size
+        self.max_age = max_age
+        self._drafts = deque()
+        self.stats = {'added': 0, 'taken': 0, 'expired': 0, 'stale': 0, 'duplicates': 0, 'empty': 0}
+
+    def __len__(self) -> int:
+        return len(self._drafts)
+
+    def configure(self, size: Optional[int] = None, max_age: Optional[float] = None):
+        """Change the pool size or draft lifetime"""
+        if size is not None:
+            self.size = size
+            while len(self._drafts) > size:
+                self._drafts.pop()
+        if max_age:
+            self.max_age = max_age
+
+    def needed(self, wanted: Optional[int] = None) -> int:
+        """Number of drafts to generate to hold ``wanted`` drafts (at most, and by default, size)"""
+        self.prune()
+        wanted = self.size if wanted is None else min(wanted, self.size)
+        return max(wanted - len(self._drafts), 0)
+
+    def _similarity(self, first: tuple, second: tuple) -> float:
+        return sum(x == y for x, y in zip(first, second)) / self.index.num_perm
+
+    def make_draft(self, post: StyledPost, text: str, topics: List[str], style: str) -> Draft:
+        return Draft(post, text, topics, style, self.index.signature(text))
+
+    def is_duplicate(self, draft: Draft) -> bool:
+        """Check a draft against published posts and the other drafts"""
+        if self.index.is_duplicate(draft.text):
+            return True
+        return any(self._similarity(draft.signature, other.signature) >= self.index.threshold
+                   for other in self._drafts if other is not draft)
+
+    def add(self, draft: Draft) -> bool:
+        """Add a draft unless it duplicates a published post or another draft"""
+        if self.is_duplicate(draft):
+            self.stats['duplicates'] += 1
+            return False
+        self._drafts.append(draft)
+        self.stats['added'] += 1
+        return True
+
+    def prune(self, trending: Optional[List[str]] = None):
+        """Drop drafts past max_age, and (given current trending topics) stale ones"""
+        current = {topic.lower() for topic in trending} if trending else None
+        kept = deque()
+        for draft in self._drafts:
+            if draft.age() >= self.max_age:
+                self.stats['expired'] += 1
+            elif current is not None and draft.topics and not current & {topic.lower() for topic in draft.topics}:
+                self.stats['stale'] += 1
+            else:
+                kept.append(draft)
+        self._drafts = kept
+
+    def take(self, trending: Optional[List[str]] = None, style: Optional[str] = None) -> Optional[Draft]:
+        """Take the oldest fresh draft (in ``style``, if given) that is still not a duplicate"""
+        self.prune(trending)
+        while self._drafts:
+            draft = self._drafts.popleft()
+            if style is not None and draft.style != style:
+                self.stats['stale'] += 1
+                continue
+            # Something similar may have been published since it was drafted
+            if self.index.is_duplicate(draft.text):
+                self.stats['duplicates'] += 1
+                continue
+            self.stats['taken'] += 1
+            return draft
+        self.stats['empty'] += 1
+        return None
+
+    def clear(self):
+        """Drop every draft"""
+        self._drafts.clear()
+
+    def get_stats(self) -> Dict:
+        """Get pool size, draft ages and counters"""
+        return dict(
+            self.stats,
+            size=self.size,
+            ready=len(self._drafts),
+            max_age=self.max_age,
+            oldest_age=round(self._drafts[0].age(), 1) if self._drafts else None
+        )
@@ -1,7 +1,11 @@
+from src.agent.llm_client import AsyncLLMClient
+from src.agent.token_meter import TokenBudgetExceeded, get_token_meter
+
 class EntertainmentHandler:
-    def __init__(self, twitter_client, gemini_model):
+    def __init__(self, twitter_client, gemini_model, token_meter=None):
         self.client = twitter_client
         self.model = gemini_model
+        self.llm = AsyncLLMClient(gemini_model, meter=token_meter or get_token_meter())
 
     async def handle_reply(self, tweet_id, tweet_text):
         """Generate and post an entertaining reply to a tweet"""
@@ -19,7 +23,10 @@ class EntertainmentHandler:
         Format: Just the reply text, no explanations.
         """
         
-        response = self.model.generate_content(prompt)
+        try:
+            response = await self.llm.generate(prompt, service='entertainment')
+        except TokenBudgetExceeded as e:
+            return {"status": "error", "message": str(e)}
         reply_text = response.text.strip()
         
         # Post the reply
@@ -3,14 +3,14 @@ class AgentHandlers:
         self.client = twitter_client
         self.llm = gemini_handler
 
-    def handle_image_analysis(self, tweet):
+    async def handle_image_analysis(self, tweet):
         """Handle Picture Perfect Agent functionality"""
         image = self._extract_image(tweet)
-        analysis = self.llm.analyze_content(tweet.text, image)
-        response = self.llm.generate_content(f"Create a friendly response about: {analysis}")
+        analysis = await self.llm.analyze_content(tweet.text, image)
+        response = await self.llm.generate_content(f"Create a friendly response about: {analysis}")
         return response.text
 
-    def handle_research(self, tweet):
+    async def handle_research(self, tweet):
         """Handle Screenshot + Research Agent functionality"""
         prompt = f"""
         Research and analyze this topic:
@@ -22,7 +22,7 @@ class AgentHandlers:
         3. Relevant context
         Format as a concise summary.
         """
-        research = self.llm.generate_content(prompt)
+        research = await self.llm.generate_content(prompt, service='research')
         return research.text
 
     def _extract_image(self, tweet):
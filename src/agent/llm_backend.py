@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import math
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+class LLMBackend:
+    """Source of model handles.
+
+    A handle exposes the GenerativeModel surface the agent uses:
+    ``generate_content(_async)``, ``count_tokens(_async)``, ``start_chat``
+    and ``model_name``.
+    """
+    name = "base"
+    requires_api_key = False
+
+    def configure(self, api_key: Optional[str] = None):
+        """Set credentials before creating models"""
+
+    def create_model(self, model_name: str, **options):
+        """Build a model handle (options: generation_config, system_instruction, ...)"""
+        raise NotImplementedError
+
+    def supports(self, option: str) -> bool:
+        """Whether create_model accepts an option"""
+        return False
+
+    def get_stats(self) -> Dict:
+        return {"backend": self.name}
+
+class GeminiBackend(LLMBackend):
+    """The live Gemini API"""
+    name = "gemini"
+    requires_api_key = True
+
+    def configure(self, api_key: Optional[str] = None):
+        if not api_key:
+            raise ValueError("Gemini API key is required")
+        genai.configure(api_key=api_key)
+
+    def create_model(self, model_name: str, **options):
+        return genai.GenerativeModel(model_name, **options)
+
+    def supports(self, option: str) -> bool:
+        return option in inspect.signature(genai.GenerativeModel).parameters
+
+# Fake outputs by prompt substring; the first match wins. Templates get
+# {n} (call number), {digest} (stable prompt hash) and {topic} (last words).
+DEFAULT_TEMPLATES = [
+    ("JSON object", '{{"body": "Fake post {n} about {topic} ✨", "hashtags": ["fake", "loadtest"], '
+                    '"language": "en", "sensitive": false}}'),
+    ("Summarize", "Earlier the conversation covered {topic}."),
+    ("trending topics", "Topic A: context {digest}\nTopic B: context\nTopic C: context"),
+    ("", "Fake reply {n} about {topic} 🤖")
+]
+
+class FakeResponse:
+    """Response with the text and usage metadata of a real one"""
+
+    def __init__(self, text: str, input_tokens: int):
+        self.text = text
+        self.usage_metadata = type('UsageMetadata', (), {
+            'prompt_token_count': input_tokens,
+            'candidates_token_count': math.ceil(len(text) / 4)
+        })()
+
+class FakeBackend(LLMBackend):
+    """Deterministic offline backend for load and throughput tests.
+
+    Latency is drawn from ``latency`` ({'distribution': 'constant' |
+    'uniform' | 'lognormal', 'mean': s, 'sigma': s, 'min': s, 'max': s})
+    and divided by ``speedup``. ``error_rate`` fails calls with a 503 and
+    ``rate_limit_rate`` with a 429 carrying a retry hint. Outputs come from
+    ``templates`` ([(prompt substring, template), ...]). All randomness is
+    drawn from one generator seeded with ``seed``.
+    """
+    name = "fake"
+
+    def __init__(self, latency: Optional[Dict] = None, speedup: float = 1.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, retry_after: float = 1.0,
+                 templates: Optional[List[Tuple[str, str]]] = None, seed: int = 0):
+        self.latency = latency or {'distribution': 'constant', 'mean': 0.0}
+        self.speedup = speedup
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.templates = [tuple(template) for template in templates] if templates else DEFAULT_TEMPLATES
+        self.random = random.Random(seed)
+        self.stats = {'calls': 0, 'errors': 0, 'rate_limited': 0, 'simulated_latency': 0.0}
+
+    def create_model(self, model_name: str, **options):
+        return FakeModel(self, model_name, **options)
+
+    def supports(self, option: str) -> bool:
+        return option in ('generation_config', 'system_instruction', 'safety_settings')
+
+    def sample_latency(self) -> float:
+        """Simulated latency in seconds, before speedup"""
+        config = self.latency
+        distribution = config.get('distribution', 'constant')
+        mean = config.get('mean', 0.0)
+        if distribution == 'uniform':
+            value = self.random.uniform(config.get('min', 0.0), config.get('max', 2 * mean))
+        elif distribution == 'lognormal':
+            # mean/sigma describe the latency itself, not the underlying normal
+            sigma = config.get('sigma', mean / 2)
+            variance = math.log(1 + (sigma / mean) ** 2) if mean else 0.0
+            value = self.random.lognormvariate(math.log(mean) - variance / 2, math.sqrt(variance)) if mean else 0.0
+        else:
+            value = mean
+        return min(max(value, config.get('min', 0.0)), config.get('max', float('inf')))
+
+    def outcome(self) -> Tuple[float, Optional[Exception]]:
+        """Latency and injected error (if any) for the next call"""
+        self.stats['calls'] += 1
+        latency = self.sample_latency()
+        self.stats['simulated_latency'] += latency
+        roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            self.stats['rate_limited'] += 1
+            return latency / self.speedup, google_exceptions.ResourceExhausted(
+                f"Quota exceeded (fake). Please retry in {self.retry_after / self.speedup:.3f}s"
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.stats['errors'] += 1
+            return latency / self.speedup, google_exceptions.ServiceUnavailable("Backend unavailable (fake)")
+        return latency / self.speedup, None
+
+    def render(self, prompt: str) -> str:
+        """Templated output for a prompt"""
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:8]
+        words = [word for word in prompt.replace('"', ' ').split() if word.isalpha()]
+        topic = ' '.join(words[-4:]) or 'something'
+        for match, template in self.templates:
+            if match in prompt:
+                return template.format(n=self.stats['calls'], digest=digest, topic=topic)
+        return f"Fake reply {self.stats['calls']}"
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, backend=self.name, simulated_latency=round(self.stats['simulated_latency'], 3),
+                    speedup=self.speedup)
+
+def _prompt_text(contents) -> str:
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    texts = []
+    for part in parts:
+        if isinstance(part, str):
+            texts.append(part)
+        elif isinstance(part, dict):
+            texts.append(_prompt_text(part.get('parts', [])))
+    return '\n'.join(texts)
+
+class FakeModel:
+    """GenerativeModel stand-in served by a FakeBackend"""
+
+    def __init__(self, backend: FakeBackend, model_name: str, generation_config=None,
+                 system_instruction: Optional[str] = None, safety_settings=None):
+        self.backend = backend
+        self.model_name = model_name
+        self.generation_config = generation_config
+        self.system_instruction = system_instruction
+
+    def _respond(self, contents) -> FakeResponse:
+        prompt = _prompt_text(contents)
+        # Templates match on the latest message, tokens count everything sent
+        is_chat = isinstance(contents, list) and any(isinstance(part, dict) for part in contents)
+        latest = _prompt_text(contents[-1]) if is_chat else prompt
+        return FakeResponse(self.backend.render(latest), math.ceil(len(prompt) / 4))
+
+    def generate_content(self, contents, **kwargs):
+        delay, error = self.backend.outcome()
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return self._respond(contents)
+
+    async def generate_content_async(self, contents, **kwargs):
+        delay, error = self.backend.outcome()
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return self._respond(contents)
+
+    def count_tokens(self, contents):
+        return type('CountTokensResponse', (), {'total_tokens': math.ceil(len(_prompt_text(contents)) / 4)})()
+
+    async def count_tokens_async(self, contents):
+        return self.count_tokens(contents)
+
+    def start_chat(self, history=None):
+        return FakeChatSession(self, history)
+
+class FakeChatSession:
+    """ChatSession stand-in that keeps the full history like the SDK does"""
+
+    def __init__(self, model: FakeModel, history=None):
+        self.model = model
+        self.history = list(history or [])
+
+    def _add(self, content, response):
+        self.history.append({'role': 'user', 'parts': [content]})
+        self.history.append({'role': 'model', 'parts': [response.text]})
+        return response
+
+    def send_message(self, content, **kwargs):
+        return self._add(content, self.model.generate_content([*self.history, content], **kwargs))
+
+    async def send_message_async(self, content, **kwargs):
+        return self._add(content, await self.model.generate_content_async([*self.history, content], **kwargs))
+
+BACKENDS = {
+    'gemini': GeminiBackend,
+    'fake': FakeBackend
+}
+
+def create_llm_backend(name: Optional[str] = None, **settings) -> LLMBackend:
+    """Build an LLM backend by name
+
+    Without arguments the LLM_BACKEND environment variable picks the
+    backend ('gemini' by default) and LLM_BACKEND_SETTINGS (JSON) supplies
+    its settings, so a test run can switch the whole agent to the fake.
+    """
+    name = name or os.getenv('LLM_BACKEND', 'gemini')
+    if name not in BACKENDS:
+        raise ValueError(f"Unsupported LLM backend: {name}")
+    if not settings and os.getenv('LLM_BACKEND_SETTINGS'):
+        settings = json.loads(os.getenv('LLM_BACKEND_SETTINGS'))
+    return BACKENDS[name](**settings)
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional
+
+class CachedResponse:
+    """Stand-in for a model response served from the cache"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+class LLMResponseCache:
+    """Prompt-keyed cache of model responses.
+
+    Keys cover the model name, the whitespace-normalized prompt and the
+    generation config. Entries live in an LRU memory tier and, when a state
+    store is given, in its ``llm_cache`` table so they survive restarts.
+    Callers opt in per call site by passing a TTL; prompts with non-text
+    parts (images) are never cached.
+    """
+
+    def __init__(self, state=None, max_entries: int = 512):
+        self.state = state
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (text, expires_at)
+        self._puts = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0}
+
+    def make_key(self, model_name: str, contents, config=None) -> Optional[str]:
+        """Build a cache key, or None if the contents can't be cached"""
+        parts = contents if isinstance(contents, (list, tuple)) else [contents]
+        if not all(isinstance(part, str) for part in parts):
+            return None
+        payload = json.dumps({
+            'model': model_name,
+            'prompt': [' '.join(part.split()) for part in parts],
+            'config': config
+        }, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response text if present and fresh"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return entry[0]
+            del self._entries[key]
+        if self.state is not None:
+            stored = self.state.get_llm_response(key)
+            if stored is not None and stored[1] > now:
+                self._remember(key, *stored)
+                self.stats['disk_hits'] += 1
+                return stored[0]
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, text: str, ttl: float):
+        """Cache a response text for ttl seconds"""
+        expires_at = time.time() + ttl
+        self._remember(key, text, expires_at)
+        self.stats['stores'] += 1
+        if self.state is not None:
+            self.state.put_llm_response(key, text, expires_at)
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self.state.prune_llm_cache()
+
+    def _remember(self, key: str, text: str, expires_at: float):
+        self._entries[key] = (text, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self):
+        """Get hit/miss counters"""
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        lookups = hits + self.stats['misses']
+        return dict(
+            self.stats,
+            entries=len(self._entries),
+            hit_rate=round(hits / lookups, 3) if lookups else None
+        )
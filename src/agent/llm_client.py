@@ -0,0 +1,302 @@
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+from src.agent.llm_cache import CachedResponse, LLMResponseCache
+from src.agent.token_meter import TokenMeter, estimate_tokens, usage_from_response
+from src.utils.retry import RetryPolicy
+
+class LLMTimeout(TimeoutError):
+    """Raised when a model call exceeds its timeout"""
+
+class LLMPool:
+    """Process-wide cap on concurrent LLM requests, with latency stats.
+
+    Every AsyncLLMClient shares one pool by default, so the Mastodon
+    platform, the Twitter agent and the handlers together never have more
+    than ``max_in_flight`` requests outstanding against the API key.
+    """
+
+    def __init__(self, max_in_flight: int = 4, timeout: float = 60.0, window: int = 200):
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._latencies = deque(maxlen=window)
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats = {'calls': 0, 'errors': 0, 'timeouts': 0}
+
+    def configure(self, max_in_flight: Optional[int] = None, timeout: Optional[float] = None):
+        """Change the in-flight limit (applies to calls that start afterwards) or default timeout"""
+        if max_in_flight and max_in_flight != self.max_in_flight:
+            self.max_in_flight = max_in_flight
+            self._semaphore = asyncio.Semaphore(max_in_flight)
+        if timeout:
+            self.timeout = timeout
+
+    async def run(self, make_call, timeout: Optional[float] = None):
+        """Run a model call under the in-flight limit and a timeout"""
+        semaphore = self._semaphore
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(make_call(), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            raise LLMTimeout(f"model call timed out after {timeout or self.timeout}s")
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+        finally:
+            self._latencies.append(time.perf_counter() - started)
+            self.stats['calls'] += 1
+            self.in_flight -= 1
+            semaphore.release()
+
+    def get_stats(self):
+        """Get call counters and recent latency percentiles"""
+        latencies = sorted(self._latencies)
+        def percentile(p):
+            return round(latencies[min(int(len(latencies) * p), len(latencies) - 1)], 3) if latencies else None
+        return dict(
+            self.stats,
+            in_flight=self.in_flight,
+            waiting=self.waiting,
+            max_in_flight=self.max_in_flight,
+            timeout=self.timeout,
+            latency_p50=percentile(0.5),
+            latency_p95=percentile(0.95),
+            latency_max=round(latencies[-1], 3) if latencies else None
+        )
+
+class AsyncLLMClient:
+    """Awaitable wrapper around a Gemini GenerativeModel.
+
+    Uses the SDK's native async methods when available and falls back to a
+    worker thread otherwise, so a slow model response never blocks the
+    event loop. Passing ``cache_ttl`` serves repeated prompts from the
+    response cache; creative call sites simply leave it out. Transient
+    failures are retried under ``retry`` (a per-call-site RetryPolicy) or
+    the client's default policy; each attempt takes its own pool slot.
+    Calls tagged with a ``service`` are checked against and recorded in the
+    token meter (cache hits cost nothing).
+    """
+
+    def __init__(self, model, pool: Optional[LLMPool] = None, cache: Optional[LLMResponseCache] = None,
+                 retry: Optional[RetryPolicy] = None, meter: Optional[TokenMeter] = None,
+                 name: Optional[str] = None):
+        self.model = model
+        # Distinguishes handles on the same model with different settings in cache keys
+        self.name = name or getattr(model, 'model_name', type(model).__name__)
+        self.pool = pool or get_llm_pool()
+        self.cache = cache
+        self.retry = retry or RetryPolicy()
+        self.meter = meter
+
+    async def generate(self, contents, timeout: Optional[float] = None,
+                       cache_ttl: Optional[float] = None, retry: Optional[RetryPolicy] = None,
+                       service: Optional[str] = None, **kwargs):
+        """Generate a response for a prompt or list of content parts"""
+        key = self._cache_key(contents, kwargs.get('generation_config'), cache_ttl)
+        if key is not None:
+            text = self.cache.get(key)
+            if text is not None:
+                return CachedResponse(text)
+        if self.meter is not None and service:
+            self.meter.check(service)
+        response = await (retry or self.retry).run(
+            lambda: self.pool.run(lambda: self._generate(contents, **kwargs), timeout),
+            label="LLM call"
+        )
+        await self._record_usage(service, contents, response)
+        if key is not None:
+            self.cache.put(key, response.text, cache_ttl)
+        return response
+
+    async def generate_text(self, contents, timeout: Optional[float] = None,
+                            cache_ttl: Optional[float] = None, retry: Optional[RetryPolicy] = None,
+                            service: Optional[str] = None, **kwargs) -> str:
+        """Generate a response and return its text"""
+        return (await self.generate(contents, timeout=timeout, cache_ttl=cache_ttl, retry=retry,
+                                    service=service, **kwargs)).text
+
+    async def _record_usage(self, service: Optional[str], contents, response):
+        if self.meter is None or not service:
+            return
+        usage = usage_from_response(response)
+        if usage is not None:
+            self.meter.record(service, *usage)
+            return
+        output_tokens = estimate_tokens(response.text)
+        count_async = getattr(self.model, 'count_tokens_async', None)
+        if self.meter.count_tokens and count_async is not None:
+            try:
+                counted = await count_async(contents)
+                self.meter.record(service, counted.total_tokens, output_tokens, estimated=True)
+                return
+            except Exception as e:
+                print(f"Error counting tokens: {str(e)}")
+        self.meter.record(service, estimate_tokens(contents), output_tokens, estimated=True)
+
+    def _cache_key(self, contents, config, cache_ttl, scope: str = ''):
+        if not cache_ttl or self.cache is None:
+            return None
+        return self.cache.make_key(f"{self.name}{scope}", contents, config)
+
+    async def _generate(self, contents, **kwargs):
+        generate_async = getattr(self.model, 'generate_content_async', None)
+        if generate_async is not None:
+            return await generate_async(contents, **kwargs)
+        return await asyncio.to_thread(self.model.generate_content, contents, **kwargs)
+
+    def start_chat(self, history=None, max_turns: int = 6, max_tokens: int = 4000,
+                   summarize: bool = True) -> "AsyncChat":
+        """Start a chat session with a bounded history whose messages go through the same pool"""
+        return AsyncChat(self, history=history, max_turns=max_turns, max_tokens=max_tokens, summarize=summarize)
+
+    def get_stats(self):
+        """Get pool usage and latency stats"""
+        return self.pool.get_stats()
+
+class AsyncChat:
+    """Chat session with a bounded rolling history.
+
+    Each turn sends only the last ``max_turns`` exchanges, trimmed further
+    to stay under ``max_tokens`` (estimated), so the context stays the same
+    size however long the process runs. With ``summarize``, exchanges that
+    fall out of the window are folded into a short running summary (one
+    extra call per ``summary_batch`` evicted exchanges) that is sent ahead
+    of the window.
+    """
+
+    SUMMARY_PROMPT = """Summarize this conversation in at most {words} words, keeping the
+facts and topics that later messages may refer back to.
+
+{summary}{turns}"""
+
+    def __init__(self, client: AsyncLLMClient, history=None, max_turns: int = 6, max_tokens: int = 4000,
+                 summarize: bool = True, summary_batch: int = 4, summary_words: int = 120):
+        self.client = client
+        self.pool = client.pool
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.summary_batch = summary_batch
+        self.summary_words = summary_words
+        self.turns = deque()  # (user text, model text)
+        self.summary = ""
+        self._evicted = []
+        for user, model in zip(*[iter(self._texts(history or []))] * 2):
+            self.turns.append((user, model))
+        # Turns are appended in order, so they must not overlap
+        self._lock = asyncio.Lock()
+        self.stats = {'turns': 0, 'evicted_turns': 0, 'summaries': 0, 'last_context_tokens': 0,
+                      'max_context_tokens': 0}
+
+    @staticmethod
+    def _texts(history):
+        texts = []
+        for message in history:
+            parts = message.get('parts', []) if isinstance(message, dict) else getattr(message, 'parts', [])
+            texts.append(' '.join(part if isinstance(part, str) else getattr(part, 'text', '') for part in parts))
+        return texts
+
+    def configure(self, max_turns: Optional[int] = None, max_tokens: Optional[int] = None,
+                  summarize: Optional[bool] = None):
+        """Change the window size, token ceiling or summarization"""
+        if max_turns:
+            self.max_turns = max_turns
+        if max_tokens:
+            self.max_tokens = max_tokens
+        if summarize is not None:
+            self.summarize = summarize
+
+    @property
+    def history(self):
+        """The context sent with the next message (summary, then the turn window)"""
+        contents = []
+        if self.summary:
+            contents.append({'role': 'user', 'parts': [f"Summary of our earlier conversation: {self.summary}"]})
+            contents.append({'role': 'model', 'parts': ["Got it."]})
+        for user, model in self.turns:
+            contents.append({'role': 'user', 'parts': [user]})
+            contents.append({'role': 'model', 'parts': [model]})
+        return contents
+
+    def _evict(self, content):
+        # Oldest exchanges go first: past the turn window, then past the token ceiling
+        while len(self.turns) > self.max_turns:
+            self._evicted.append(self.turns.popleft())
+        while self.turns and estimate_tokens([*self.history, content]) > self.max_tokens:
+            self._evicted.append(self.turns.popleft())
+        if not self.summarize:
+            self.stats['evicted_turns'] += len(self._evicted)
+            self._evicted.clear()
+
+    async def _summarize(self, timeout, retry, service):
+        turns = '\n'.join(f"User: {user}\nAssistant: {model}" for user, model in self._evicted)
+        summary = f"Earlier summary: {self.summary}\n\n" if self.summary else ""
+        prompt = self.SUMMARY_PROMPT.format(words=self.summary_words, summary=summary, turns=turns)
+        try:
+            response = await self.client.generate(prompt, timeout=timeout, retry=retry, service=service)
+            # Keep the summary bounded even if the model ignores the word limit
+            self.summary = ' '.join(response.text.split()[:self.summary_words * 2])
+            self.stats['summaries'] += 1
+        except Exception as e:
+            print(f"Error summarizing chat history: {str(e)}")
+        self.stats['evicted_turns'] += len(self._evicted)
+        self._evicted.clear()
+
+    async def send_message(self, content, timeout: Optional[float] = None,
+                           cache_ttl: Optional[float] = None, retry: Optional[RetryPolicy] = None,
+                           service: Optional[str] = None, **kwargs):
+        """Send a message with the bounded history and wait for the reply
+
+        With cache_ttl, a recent reply to the same message is reused and the
+        turn is not added to the history.
+        """
+        key = self.client._cache_key(content, kwargs.get('generation_config'), cache_ttl, scope=':chat')
+        if key is not None:
+            text = self.client.cache.get(key)
+            if text is not None:
+                return CachedResponse(text)
+        async with self._lock:
+            self._evict(content)
+            if len(self._evicted) >= self.summary_batch:
+                await self._summarize(timeout, retry, service)
+            contents = [*self.history, {'role': 'user', 'parts': [content]}]
+            context_tokens = estimate_tokens(contents)
+            response = await self.client.generate(contents, timeout=timeout, retry=retry, service=service, **kwargs)
+            self.turns.append((content, response.text))
+            self._evict('')
+            self.stats['turns'] += 1
+            self.stats['last_context_tokens'] = context_tokens
+            self.stats['max_context_tokens'] = max(self.stats['max_context_tokens'], context_tokens)
+        if key is not None:
+            self.client.cache.put(key, response.text, cache_ttl)
+        return response
+
+    def get_stats(self):
+        """Get history size and context metrics"""
+        return dict(
+            self.stats,
+            window_turns=len(self.turns),
+            pending_summary_turns=len(self._evicted),
+            summary_tokens=estimate_tokens(self.summary) if self.summary else 0,
+            max_turns=self.max_turns,
+            max_tokens=self.max_tokens
+        )
+
+_shared_pool = None
+
+def get_llm_pool() -> LLMPool:
+    """Get the process-wide LLM request pool"""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = LLMPool()
+    return _shared_pool
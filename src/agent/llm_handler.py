@@ -1,14 +1,24 @@
+from src.agent.llm_cache import LLMResponseCache
+from src.agent.llm_client import AsyncLLMClient
+from src.agent.token_meter import get_token_meter
+from src.utils.media import get_media_fetcher
+
 class GeminiHandler:
-    def __init__(self, config=None):
+    def __init__(self, config=None, media_fetcher=None, llm_cache=None, token_meter=None):
         self.gemini = config.model if config else None
+        self.llm_cache = llm_cache or LLMResponseCache()
+        # Usage is metered with the platform's services in the shared meter
+        self.token_meter = token_meter or get_token_meter()
+        self.llm = AsyncLLMClient(self.gemini, cache=self.llm_cache, meter=self.token_meter) if self.gemini else None
+        self.media = media_fetcher or get_media_fetcher()
         
-    def analyze_content(self, content, image=None):
-        """Analyze text or image content using Gemini"""
+    async def analyze_content(self, content, image=None, cache_ttl=None, service='analysis'):
+        """Analyze text or image content using Gemini (text-only results can be cached)"""
         if image:
-            return self._analyze_with_image(content, image)
-        return self._analyze_text(content)
+            return await self._analyze_with_image(content, image, service=service)
+        return await self._analyze_text(content, cache_ttl=cache_ttl, service=service)
     
-    def _analyze_text(self, text):
+    async def _analyze_text(self, text, cache_ttl=None, service='analysis'):
         prompt = f"""
         Analyze this tweet content and provide insights:
         {text}
@@ -18,10 +28,10 @@ class GeminiHandler:
         2. Key points
         3. Suggested response
         """
-        response = self.generate_content(prompt)
+        response = await self.generate_content(prompt, cache_ttl=cache_ttl, service=service)
         return response.text
 
-    def _analyze_with_image(self, text, image):
+    async def _analyze_with_image(self, text, image, service='analysis'):
         """Analyze content with image using Gemini's multimodal capabilities"""
         prompt = f"""
         Analyze this post and its image:
@@ -35,16 +45,21 @@ class GeminiHandler:
         """
         
         try:
+            # Image URLs go through the shared pooled downloader
+            if isinstance(image, str):
+                image = await self.media.fetch_image(image)
+                if image is None:
+                    return await self._analyze_text(text, service=service)
             content_parts = [prompt, image]
-            response = self.gemini.generate_content(content_parts)
+            response = await self.generate_content(content_parts, service=service)
             return response.text
         except Exception as e:
             print(f"Error in image analysis: {str(e)}")
-            return self._analyze_text(text)  # Fallback to text-only analysis
+            return await self._analyze_text(text, service=service)  # Fallback to text-only analysis
 
-    def generate_content(self, prompt):
+    async def generate_content(self, prompt, cache_ttl=None, service='analysis'):
         """Direct generation method for simple prompts"""
-        if self.gemini:
-            return self.gemini.generate_content(prompt)
+        if self.llm:
+            return await self.llm.generate(prompt, cache_ttl=cache_ttl, service=service)
         # Fallback response if no model is configured
-        return type('Response', (), {'text': 'Model not configured'})()
\ No newline at end of file
+        return type('Response', (), {'text': 'Model not configured'})()
@@ -0,0 +1,115 @@
+from typing import Dict, Optional
+from src.agent.llm_backend import LLMBackend
+from src.agent.llm_client import AsyncLLMClient, LLMPool
+
+# Style preambles, keyed by PostStyle value
+STYLE_INSTRUCTIONS = {
+    "meme": """Transform this into a meme-style post:
+- Use internet humor
+- Add trending references
+- Include popular emojis
+- Keep it light and funny
+- Add meme-related hashtags""",
+    "entertainer": """Create an entertaining post:
+- Make it fun and engaging
+- Use witty language
+- Include relevant emojis
+- Add pop culture references
+- Keep it conversational""",
+    "informative": """Create an informative post:
+- Focus on facts
+- Use clear language
+- Add educational value
+- Include relevant statistics
+- Add topic-specific hashtags""",
+    "storyteller": """Transform this into a narrative-style post:
+- Create a mini-story
+- Build intrigue
+- Use descriptive language
+- End with a hook
+- Add story-related hashtags""",
+    "analyst": """Create an analytical post:
+- Present data-driven insights
+- Include trend analysis
+- Use professional terminology
+- Add relevant metrics
+- Include industry hashtags"""
+}
+
+# Sampling per style: playful styles run hot, factual ones cool
+STYLE_SAMPLING = {
+    "meme": {'temperature': 1.0, 'top_p': 0.95, 'top_k': 64},
+    "entertainer": {'temperature': 0.9, 'top_p': 0.9, 'top_k': 40},
+    "informative": {'temperature': 0.4, 'top_p': 0.8, 'top_k': 32},
+    "storyteller": {'temperature': 0.9, 'top_p': 0.95, 'top_k': 40},
+    "analyst": {'temperature': 0.3, 'top_p': 0.8, 'top_k': 32}
+}
+
+def max_output_tokens(max_length: int) -> int:
+    """Output token cap for a post of max_length characters wrapped in the JSON envelope"""
+    # ~2 characters per token leaves room for emojis and non-English text;
+    # the envelope (keys, hashtags, language) adds about 64 tokens
+    return max_length // 2 + 64
+
+class StyleModelRegistry:
+    """One model handle per post style, built on first use and reused.
+
+    Each handle carries its style preamble as the model's system
+    instruction and the style's sampling settings, so prompts only contain
+    the content. SDK versions without ``system_instruction`` get the
+    preamble prepended by ``prompt()`` instead. Handles are rebuilt when
+    the post length (and so the output token cap) changes.
+    """
+
+    def __init__(self, backend: LLMBackend, model_name: str, max_length: int = 240,
+                 pool: Optional[LLMPool] = None, **client_options):
+        self.backend = backend
+        self.model_name = model_name
+        self.max_length = max_length
+        self.pool = pool
+        self.client_options = client_options
+        self.supports_system_instruction = backend.supports('system_instruction')
+        self._handles: Dict[str, AsyncLLMClient] = {}
+        self.builds = 0
+
+    def configure(self, max_length: Optional[int] = None):
+        """Change the post length; handles are rebuilt on next use"""
+        if max_length and max_length != self.max_length:
+            self.max_length = max_length
+            self._handles.clear()
+
+    def generation_config(self, style: str) -> Dict:
+        """Sampling settings and output cap for a style"""
+        return dict(STYLE_SAMPLING.get(style, {}), max_output_tokens=max_output_tokens(self.max_length))
+
+    def get(self, style: str) -> AsyncLLMClient:
+        """Get the client for a style"""
+        handle = self._handles.get(style)
+        if handle is None:
+            options = {'generation_config': self.generation_config(style)}
+            if self.supports_system_instruction:
+                options['system_instruction'] = STYLE_INSTRUCTIONS[style]
+            model = self.backend.create_model(self.model_name, **options)
+            handle = AsyncLLMClient(
+                model, pool=self.pool,
+                name=f"{self.model_name}:{style}:{self.max_length}",
+                **self.client_options
+            )
+            self._handles[style] = handle
+            self.builds += 1
+        return handle
+
+    def prompt(self, style: str, content: str) -> str:
+        """Prompt text for a style (just the content when the model holds the preamble)"""
+        if self.supports_system_instruction:
+            return content
+        return f"{STYLE_INSTRUCTIONS[style]}\n\n{content}"
+
+    def get_stats(self):
+        """Get built handles"""
+        return {
+            "styles": sorted(self._handles),
+            "builds": self.builds,
+            "system_instruction": self.supports_system_instruction,
+            "max_output_tokens": max_output_tokens(self.max_length)
+        }
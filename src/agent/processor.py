@@ -11,8 +11,6 @@ class PostProcessor:
         self.sent_logs = set()  # Track logs that have been sent to UI
         self.posts_processed = 0
         self.responses_sent = 0
-        self.processed_posts = set()
-        self.processed_mentions = set()
 
     def stop(self):
         """Stop the processor and all platform services"""
@@ -24,8 +22,14 @@ class PostProcessor:
                     'auto_post': False,
                     'dm': False,
                     'auto_like': False,
-                    'hashtag': False
+                    'hashtag': False,
+                    'mention': False
                 }
+                # Release Mastodon I/O threads
+                self.platform.api.shutdown()
+                # Write out batched state and release the writer thread,
+                # database connections and seen-index files
+                self.platform.close()
             self.log_info("Agent stopped successfully")
         except Exception as e:
             self.log_error(f"Error stopping agent: {str(e)}")
@@ -46,6 +50,7 @@ class PostProcessor:
                 'max_daily_posts': config.auto_post_settings.max_daily_posts
             })
             self.platform.update_settings('dm', config.dm_settings)
+            self.platform.update_settings('mention', config.mention_settings)
             self.platform.update_settings('like', config.like_settings)
             self.platform.update_settings('post_style', {
                 'max_length': config.response.maxLength,
@@ -100,6 +105,11 @@ class PostProcessor:
             "responses_sent": self.responses_sent,
             "services": platform_status['services'],
             "settings": platform_status['settings'],
+            # I/O pool, cache, stream and rate-limit state for monitoring
+            "metrics": {
+                key: value for key, value in platform_status.items()
+                if key not in ('services', 'settings')
+            },
             "logs": new_logs  # Send only new logs
         }
 
@@ -0,0 +1,132 @@
+import json
+import re
+from typing import List, Optional
+from pydantic import BaseModel, ValidationError, field_validator
+
+HASHTAG_PATTERN = re.compile(r'#(\w+)')
+FENCE_PATTERN = re.compile(r'^```(?:json)?\s*|\s*```$')
+TRAILING_COMMA_PATTERN = re.compile(r',\s*([}\]])')
+# Salvages the body from JSON that was cut off or otherwise unparseable
+BODY_PATTERN = re.compile(r'"body"\s*:\s*"((?:[^"\\]|\\.)*)')
+# Keys models put the post text under when they ignore the requested schema
+BODY_KEYS = ('body', 'text', 'post', 'content', 'message')
+
+STYLED_POST_FORMAT = """
+Respond with only a JSON object (no markdown, no code fences) of this form:
+{{"body": "the post text, without hashtags", "hashtags": [{hashtags}], "language": "ISO 639-1 code of the body", "sensitive": false}}
+Set "sensitive" to true only if the post needs a content warning.
+"""
+
+class StyledPost(BaseModel):
+    """Post body plus metadata, as returned by a single structured generation"""
+    body: str
+    hashtags: List[str] = []
+    language: Optional[str] = None
+    sensitive: bool = False
+
+    @field_validator('body')
+    @classmethod
+    def body_not_empty(cls, value):
+        value = value.strip()
+        if not value:
+            raise ValueError("body is empty")
+        return value
+
+    @field_validator('hashtags', mode='before')
+    @classmethod
+    def normalize_hashtags(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            value = value.split()
+        tags, seen = [], set()
+        for tag in value:
+            tag = ''.join(HASHTAG_PATTERN.findall('#' + str(tag).lstrip('#')))
+            if tag and tag.lower() not in seen:
+                seen.add(tag.lower())
+                tags.append(tag)
+        return tags
+
+    @field_validator('language', mode='before')
+    @classmethod
+    def normalize_language(cls, value):
+        if isinstance(value, str) and value.strip().isalpha() and 2 <= len(value.strip()) <= 3:
+            return value.strip().lower()
+        return None
+
+def styled_post_format(max_tags: int = 3) -> str:
+    """Output instructions appended to a styled-post prompt"""
+    hashtags = f'"up to {max_tags} relevant hashtags, without #"' if max_tags else ''
+    return STYLED_POST_FORMAT.format(hashtags=hashtags)
+
+def _load_json(text: str):
+    text = FENCE_PATTERN.sub('', text.strip())
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end < start:
+        raise ValueError("no JSON object in response")
+    text = text[start:end + 1]
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        # Common model slips: smart quotes, trailing commas, Python literals
+        text = text.replace('“', '"').replace('”', '"')
+        text = TRAILING_COMMA_PATTERN.sub(r'\1', text)
+        text = re.sub(r'\bTrue\b', 'true', re.sub(r'\bFalse\b', 'false', re.sub(r'\bNone\b', 'null', text)))
+        return json.loads(text)
+
+def _salvage_styled_post(data) -> StyledPost:
+    """Build a StyledPost from JSON that doesn't fit the schema, dropping bad fields"""
+    if not isinstance(data, dict):
+        raise ValueError("JSON response is not an object")
+    body = next((data[key] for key in BODY_KEYS
+                 if isinstance(data.get(key), str) and data[key].strip()), None)
+    if body is None:
+        raise ValueError("no post text in JSON response")
+    post = StyledPost(body=body)
+    for field in ('hashtags', 'language', 'sensitive'):
+        if field in data:
+            try:
+                post = StyledPost.model_validate(dict(post.model_dump(), **{field: data[field]}))
+            except ValidationError:
+                pass
+    return post
+
+def parse_styled_post(text: str) -> StyledPost:
+    """Parse a structured generation, repairing or falling back to plain text
+
+    Valid (or lightly broken) JSON is validated against StyledPost; if it
+    doesn't fit, the text is taken from a "text"-like key and invalid
+    metadata is dropped, raising ValueError when there is no text at all.
+    Otherwise the body is salvaged from a truncated JSON string, or the
+    whole response is treated as the post with its inline #hashtags pulled
+    out.
+    """
+    try:
+        data = _load_json(text)
+    except ValueError:
+        data = None
+    if data is not None:
+        try:
+            return StyledPost.model_validate(data)
+        except ValidationError:
+            return _salvage_styled_post(data)
+    match = BODY_PATTERN.search(text)
+    if match:
+        try:
+            body = json.loads(f'"{match.group(1)}"')
+        except json.JSONDecodeError:
+            body = match.group(1)
+        hashtags = []
+    else:
+        body = FENCE_PATTERN.sub('', text.strip())
+        hashtags = HASHTAG_PATTERN.findall(body)
+        body = HASHTAG_PATTERN.sub('', body)
+    return StyledPost(body=' '.join(body.split()), hashtags=hashtags)
+
+def render_styled_post(post: StyledPost, max_length: Optional[int] = None, max_tags: int = 3) -> str:
+    """Post text: body (cut to max_length) plus hashtags on their own line if they fit"""
+    text = post.body[:max_length].strip() if max_length else post.body
+    tags = ' '.join(f'#{tag}' for tag in post.hashtags[:max_tags])
+    if tags and (not max_length or len(text) + len(tags) + 1 <= max_length):
+        text += f"\n{tags}"
+    return text
@@ -0,0 +1,174 @@
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+# Gemini bills an image as a fixed number of input tokens
+IMAGE_TOKENS = 258
+
+class TokenBudgetExceeded(Exception):
+    """Raised instead of making a call when a service is out of token budget.
+
+    ``action`` is 'defer' for low-priority work (skip it until the window
+    rolls over) or 'degrade' for high-priority work (answer without the model).
+    """
+
+    def __init__(self, service: str, action: str):
+        super().__init__(f"{service} token budget exhausted ({action})")
+        self.service = service
+        self.action = action
+
+def estimate_tokens(contents) -> int:
+    """Rough token count: ~4 characters per token for text, a flat rate per image"""
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    total = 0
+    for part in parts:
+        if isinstance(part, str):
+            total += math.ceil(len(part) / 4)
+        elif isinstance(part, dict) and 'parts' in part:
+            # A chat message: {'role': ..., 'parts': [...]}
+            total += estimate_tokens(part['parts'])
+        else:
+            total += IMAGE_TOKENS
+    return total
+
+def usage_from_response(response) -> Optional[Tuple[int, int]]:
+    """(input, output) token counts reported by the API, if any"""
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is None:
+        return None
+    return getattr(usage, 'prompt_token_count', 0), getattr(usage, 'candidates_token_count', 0)
+
+class TokenMeter:
+    """Per-service LLM token usage with hourly and daily budgets.
+
+    ``budgets`` maps a service name to {'hourly': tokens, 'daily': tokens,
+    'priority': 'high' | 'low'}; services without an entry are metered but
+    never limited. Low-priority services are deferred once they pass
+    ``soft_limit`` of either budget; high-priority services keep running
+    until a budget is spent and are then degraded. Usage windows are
+    calendar hours and UTC days, persisted in the state store.
+    """
+
+    def __init__(self, state=None, budgets: Optional[Dict] = None, soft_limit: float = 0.8,
+                 count_tokens: bool = False):
+        self.state = state
+        self.budgets = budgets if budgets is not None else {}
+        self.soft_limit = soft_limit
+        # Ask the API for exact input counts when responses carry no usage
+        # metadata (one extra, unmetered request per call)
+        self.count_tokens = count_tokens
+        self.usage = state.get_value('token_usage', {}) if state is not None else {}
+
+    def attach(self, state):
+        """Persist usage in a state store
+
+        Usage metered before any store was attached is added to the stored
+        usage; switching from one store to another loads the new store's.
+        """
+        stored = state.get_value('token_usage', {})
+        if self.state is not None:
+            self.state, self.usage = state, stored
+            return
+        self.state = state
+        for service, entry in stored.items():
+            current = self.usage.get(service)
+            if current is None:
+                self.usage[service] = entry
+            else:
+                for key, value in entry.items():
+                    if key in ('hour', 'day'):
+                        continue
+                    # Window totals only carry over within the same hour/day
+                    period = key.split('_')[0]
+                    if key in ('hour_tokens', 'day_tokens') and entry.get(period) != current.get(period):
+                        continue
+                    current[key] = current.get(key, 0) + value
+        state.set_value('token_usage', self.usage)
+
+    def _entry(self, service: str) -> Dict:
+        now = time.time()
+        hour, day = int(now // 3600), time.strftime('%Y-%m-%d', time.gmtime(now))
+        entry = self.usage.setdefault(service, {
+            'hour': hour, 'hour_tokens': 0, 'day': day, 'day_tokens': 0,
+            'input_tokens': 0, 'output_tokens': 0, 'calls': 0, 'estimated_calls': 0,
+            'deferred': 0, 'degraded': 0
+        })
+        if entry['hour'] != hour:
+            entry['hour'], entry['hour_tokens'] = hour, 0
+        if entry['day'] != day:
+            entry['day'], entry['day_tokens'] = day, 0
+        return entry
+
+    def used_fraction(self, service: str) -> float:
+        """Largest share of the hourly or daily budget used so far"""
+        budget = self.budgets.get(service) or {}
+        entry = self._entry(service)
+        fractions = [entry[f'{period}_tokens'] / budget[limit]
+                     for period, limit in (('hour', 'hourly'), ('day', 'daily'))
+                     if budget.get(limit)]
+        return max(fractions, default=0.0)
+
+    def admit(self, service: str) -> str:
+        """Decide whether a call may run: 'ok', 'defer' or 'degrade'"""
+        fraction = self.used_fraction(service)
+        low_priority = (self.budgets.get(service) or {}).get('priority', 'low') == 'low'
+        if low_priority and fraction >= self.soft_limit:
+            self._entry(service)['deferred'] += 1
+            return 'defer'
+        if fraction >= 1.0:
+            self._entry(service)['degraded'] += 1
+            return 'degrade'
+        return 'ok'
+
+    def check(self, service: str):
+        """Raise TokenBudgetExceeded unless the service may make a call"""
+        action = self.admit(service)
+        if action != 'ok':
+            raise TokenBudgetExceeded(service, action)
+
+    def record(self, service: str, input_tokens: int, output_tokens: int, estimated: bool = False):
+        """Add a call's token usage to a service"""
+        entry = self._entry(service)
+        total = input_tokens + output_tokens
+        entry['hour_tokens'] += total
+        entry['day_tokens'] += total
+        entry['input_tokens'] += input_tokens
+        entry['output_tokens'] += output_tokens
+        entry['calls'] += 1
+        if estimated:
+            entry['estimated_calls'] += 1
+        if self.state is not None:
+            self.state.set_value('token_usage', self.usage)
+
+    def get_stats(self) -> Dict:
+        """Get usage and remaining budget per service"""
+        stats = {}
+        for service in sorted(set(self.usage) | set(self.budgets)):
+            entry = self._entry(service)
+            budget = self.budgets.get(service) or {}
+            stats[service] = {
+                key: entry[key] for key in ('hour_tokens', 'day_tokens', 'input_tokens', 'output_tokens',
+                                            'calls', 'estimated_calls', 'deferred', 'degraded')
+            }
+            stats[service].update(
+                priority=budget.get('priority', 'low'),
+                hourly_budget=budget.get('hourly'),
+                daily_budget=budget.get('daily'),
+                used=round(self.used_fraction(service), 3)
+            )
+        return stats
+
+_shared_meter = None
+
+def get_token_meter(state=None) -> TokenMeter:
+    """Get the process-wide token meter shared by every LLM client
+
+    Passing a state store makes the usage persistent in it (the latest
+    store wins, e.g. when a platform is rebuilt).
+    """
+    global _shared_meter
+    if _shared_meter is None:
+        _shared_meter = TokenMeter(state)
+    elif state is not None and _shared_meter.state is not state:
+        _shared_meter.attach(state)
+    return _shared_meter
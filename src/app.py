@@ -7,6 +7,7 @@ import asyncio
 import os
 from dotenv import load_dotenv
 from src.platforms.mastodon import MastodonPlatform
+from src.agent.llm_backend import create_llm_backend
 from src.agent.processor import PostProcessor
 from pydantic import BaseModel, validator
 
@@ -59,17 +60,27 @@ class DMConfig(BaseModel):
     enabled: bool = False
     auto_reply: bool = True
     reply_interval: int = 300  # 5 minutes
+    workers: int = 4  # Concurrent DM replies per sweep
+    max_pages: int = 10  # Conversation pages fetched per sweep
+
+class MentionConfig(BaseModel):
+    enabled: bool = True  # Auto-reply to mentions
 
 class LikeConfig(BaseModel):
     enabled: bool = False
     max_likes_per_hour: int = 20
     like_probability: float = 0.7
+    workers: int = 4  # Concurrent favourite requests per batch
 
 class AutoPostConfig(BaseModel):
     enabled: bool = True
     interval: int = 1800  # 30 minutes in seconds
     max_daily_posts: int = 48  # 2 posts per hour for 24 hours
     
+class LLMBackendConfig(BaseModel):
+    name: str = "gemini"  # "gemini" or "fake" (offline, for load tests)
+    settings: Dict = {}  # Backend options, e.g. latency/speedup/error_rate for "fake"
+
 class PlatformConfig(BaseModel):
     platform: str
     credentials: MastodonCredentials
@@ -79,8 +90,11 @@ class PlatformConfig(BaseModel):
     filters: Filters
     postStyle: PostStyleConfig
     dm_settings: Optional[DMConfig] = DMConfig()
+    mention_settings: Optional[MentionConfig] = MentionConfig()
     like_settings: Optional[LikeConfig] = LikeConfig()
     auto_post_settings: Optional[AutoPostConfig] = AutoPostConfig()
+    ingestion_mode: Optional[str] = "polling"  # "polling" or "streaming"
+    llm_backend: Optional[LLMBackendConfig] = None
 
     class Config:
         validate_assignment = True
@@ -105,6 +119,19 @@ class PlatformConfig(BaseModel):
 processor = PostProcessor()
 background_task = None
 
+async def shutdown_agent():
+    """Cancel the running services, then close the platform they were using"""
+    global background_task
+    if background_task:
+        background_task.cancel()
+        try:
+            await background_task
+        except asyncio.CancelledError:
+            pass
+        background_task = None
+    if processor.platform:
+        processor.stop()
+
 @app.post("/api/start")
 async def start_agent(config: PlatformConfig):
     global background_task, processor
@@ -130,10 +157,18 @@ async def start_agent(config: PlatformConfig):
                 'gemini_api_key': config.credentials.gemini_api_key
             }
             
+            # The new platform opens the same state files; release the old one first
+            await shutdown_agent()
+            
             try:
-                platform = MastodonPlatform(credentials)
+                llm_backend = None
+                if config.llm_backend:
+                    llm_backend = create_llm_backend(config.llm_backend.name, **config.llm_backend.settings)
+                platform = MastodonPlatform(credentials, ingestion_mode=config.ingestion_mode,
+                                            llm_backend=llm_backend)
                 platform.processor = processor  # Set processor reference
                 platform.dm_settings = config.dm_settings.dict()
+                platform.mention_settings = config.mention_settings.dict()
                 platform.like_settings = config.like_settings.dict()
                 platform.auto_post_settings = config.auto_post_settings.dict()
                 processor.platform = platform
@@ -143,14 +178,6 @@ async def start_agent(config: PlatformConfig):
 
         processor.config = config
         
-        # Cancel existing task if running
-        if background_task:
-            background_task.cancel()
-            try:
-                await background_task
-            except asyncio.CancelledError:
-                pass
-        
         # Start new background task
         background_task = asyncio.create_task(processor.start_processing())
         print("Background task created")
@@ -169,19 +196,9 @@ async def start_agent(config: PlatformConfig):
 
 @app.post("/api/stop")
 async def stop_agent():
-    global background_task
     try:
-        # Stop the processor
-        processor.stop()
-        
-        # Cancel the background task
-        if background_task:
-            background_task.cancel()
-            try:
-                await background_task
-            except asyncio.CancelledError:
-                pass
-            background_task = None
+        # Cancel the services before their state is closed
+        await shutdown_agent()
         
         return {
             "status": "success", 
@@ -239,6 +256,26 @@ async def update_dm_settings(dm_config: DMConfig):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/update-mention-settings")
+async def update_mention_settings(mention_config: MentionConfig):
+    try:
+        if not processor or not processor.platform:
+            raise HTTPException(
+                status_code=400, 
+                detail="Agent not initialized. Please start the agent first."
+            )
+            
+        processor.platform.mention_settings = mention_config.dict()
+        return {
+            "status": "success",
+            "message": "Mention settings updated",
+            "settings": mention_config.dict()
+        }
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/update-like-settings")
 async def update_like_settings(like_config: LikeConfig):
     try:
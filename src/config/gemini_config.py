@@ -1,15 +1,13 @@
-from google.generativeai import configure
-import google.generativeai as genai
+from src.agent.llm_backend import create_llm_backend
 
 class GeminiConfig:
-    def __init__(self, api_key):
-        if not api_key:
-            raise ValueError("Gemini API key is required")
+    def __init__(self, api_key, backend=None):
+        self.backend = backend or create_llm_backend()
         
-        # Configure the Gemini API
-        genai.configure(api_key=api_key)
+        # Configure the Gemini API (or the offline backend)
+        self.backend.configure(api_key=api_key)
         try:
-            self.model = genai.GenerativeModel('gemini-1.5-flash-latest')
+            self.model = self.backend.create_model('gemini-1.5-flash-latest')
         except Exception as e:
             raise Exception(f"Failed to initialize Gemini model: {str(e)}")
         
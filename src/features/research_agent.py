@@ -1,3 +1,6 @@
+# Research on the same text is reused for a few hours
+RESEARCH_CACHE_TTL = 6 * 3600
+
 class ResearchAgent:
     def __init__(self, gemini_handler):
         self.llm = gemini_handler
@@ -16,7 +19,8 @@ class ResearchAgent:
         6. Format as concise bullet points
         """
         
-        response = await self.llm.analyze_content(prompt, image)
+        response = await self.llm.analyze_content(prompt, image, cache_ttl=RESEARCH_CACHE_TTL,
+                                                 service='research')
         return self._format_research(response)
     
     def _format_research(self, raw_response):
@@ -14,5 +14,5 @@ class SentimentAnalyzer:
         Format as JSON.
         """
         
-        response = await self.llm.analyze_content(prompt)
+        response = await self.llm.analyze_content(prompt, service='sentiment')
         return self._parse_sentiment(response) 
\ No newline at end of file
@@ -1,8 +1,12 @@
+from src.agent.llm_client import AsyncLLMClient
+from src.agent.token_meter import get_token_meter
+
 class ThreadGenerator:
-    def __init__(self, gemini_config):
-        self.llm = gemini_config.model
+    def __init__(self, gemini_config, token_meter=None):
+        # Calls go through the shared LLM pool and are metered as 'threads'
+        self.llm = AsyncLLMClient(gemini_config.model, meter=token_meter or get_token_meter())
 
-    def generate_thread(self, topic):
+    async def generate_thread(self, topic):
         prompt = f"""
         Create a viral Twitter thread about:
         {topic}
@@ -24,8 +28,8 @@ class ThreadGenerator:
         """
         
         try:
-            response = self.llm.generate_content(prompt)
-            return self._format_thread(response.text)
+            response = await self.llm.generate_text(prompt, service='threads')
+            return self._format_thread(response)
         except Exception as e:
             print(f"Error generating thread: {str(e)}")
             return []
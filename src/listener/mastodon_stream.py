@@ -0,0 +1,120 @@
+import asyncio
+import json
+import random
+from typing import Awaitable, Callable, Dict, Optional
+
+import aiohttp
+
+STREAM_PATHS = {
+    'user': '/api/v1/streaming/user',
+    'hashtag': '/api/v1/streaming/hashtag',
+    'direct': '/api/v1/streaming/direct'
+}
+
+class StreamUnavailable(Exception):
+    """Raised when a stream cannot be used and callers should poll instead"""
+
+def normalize_ids(value):
+    """Convert string snowflake IDs to ints, matching Mastodon.py's parsing"""
+    if isinstance(value, dict):
+        return {
+            key: int(item) if (key == 'id' or key.endswith('_id')) and isinstance(item, str) and item.isdigit()
+            else normalize_ids(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [normalize_ids(item) for item in value]
+    return value
+
+class MastodonStreamListener:
+    """Server-sent events consumer for Mastodon's streaming API.
+
+    Reconnects with jittered exponential backoff and raises
+    StreamUnavailable once the server rejects the stream outright or
+    ``max_failures`` consecutive connection attempts fail.
+    """
+
+    def __init__(self, streaming_url: str, access_token: str,
+                 on_event: Callable[[str, Dict], Awaitable[None]],
+                 max_failures: int = 5, backoff_base: float = 1.0,
+                 backoff_max: float = 300.0, heartbeat_timeout: float = 90.0):
+        self.streaming_url = streaming_url.rstrip('/')
+        self.access_token = access_token
+        self.on_event = on_event
+        self.max_failures = max_failures
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.heartbeat_timeout = heartbeat_timeout
+        self.connected = False
+        self.events_received = 0
+        self.reconnects = 0
+
+    async def run(self, stream: str, params: Optional[Dict] = None):
+        """Consume a stream until cancelled"""
+        url = self.streaming_url + STREAM_PATHS[stream]
+        headers = {'Authorization': f'Bearer {self.access_token}'}
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=self.heartbeat_timeout)
+        failures = 0
+
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            while True:
+                try:
+                    async with session.get(url, params=params or {}) as response:
+                        if response.status in (401, 403, 404, 501):
+                            raise StreamUnavailable(f"{stream} stream rejected with HTTP {response.status}")
+                        response.raise_for_status()
+                        self.connected = True
+                        failures = 0
+                        await self._consume(response)
+                    # Server closed the stream cleanly; reconnect after a short pause
+                    self.reconnects += 1
+                    await asyncio.sleep(self.backoff_base)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    failures += 1
+                    self.reconnects += 1
+                    if failures >= self.max_failures:
+                        raise StreamUnavailable(f"{stream} stream failed {failures} times: {str(e)}")
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** (failures - 1))
+                    delay *= random.uniform(0.5, 1.0)
+                    print(f"⚠️ {stream} stream dropped ({str(e)}), reconnecting in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
+                finally:
+                    self.connected = False
+
+    async def _consume(self, response):
+        """Parse server-sent events and dispatch them"""
+        event_type = None
+        data_lines = []
+        async for raw_line in response.content:
+            line = raw_line.decode('utf-8').rstrip('\r\n')
+            if not line:
+                if event_type and data_lines:
+                    await self._dispatch(event_type, '\n'.join(data_lines))
+                event_type = None
+                data_lines = []
+            elif line.startswith(':'):
+                continue  # Heartbeat
+            elif line.startswith('event:'):
+                event_type = line[6:].strip()
+            elif line.startswith('data:'):
+                data_lines.append(line[5:].lstrip())
+
+    async def _dispatch(self, event_type: str, data: str):
+        try:
+            payload = normalize_ids(json.loads(data))
+        except ValueError:
+            # delete events carry a bare status ID
+            payload = data
+        self.events_received += 1
+        try:
+            await self.on_event(event_type, payload)
+        except Exception as e:
+            print(f"❌ Error handling {event_type} stream event: {str(e)}")
+
+    def get_stats(self):
+        """Get connection state and counters"""
+        return {
+            "connected": self.connected,
+            "events_received": self.events_received,
+            "reconnects": self.reconnects
+        }
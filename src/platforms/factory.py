@@ -6,8 +6,12 @@ from .pleroma import PleromaPlatform
 
 class PlatformFactory:
     @staticmethod
-    def create_platform(platform_type: str, credentials: Dict) -> SocialPlatform:
-        """Create a platform instance based on type"""
+    def create_platform(platform_type: str, credentials: Dict, **options) -> SocialPlatform:
+        """Create a platform instance based on type
+
+        Extra options (e.g. llm_backend=create_llm_backend('fake')) are passed
+        to the platform constructor.
+        """
         platforms = {
             'twitter': TwitterAIAgent,
             'mastodon': MastodonPlatform,
@@ -17,4 +21,4 @@ class PlatformFactory:
         if platform_type not in platforms:
             raise ValueError(f"Unsupported platform: {platform_type}")
             
-        return platforms[platform_type](credentials) 
\ No newline at end of file
+        return platforms[platform_type](credentials, **options) 
\ No newline at end of file
@@ -1,25 +1,33 @@
 from mastodon import Mastodon
 from typing import List, Dict, Optional
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-import google.generativeai as genai
 import os
 from dotenv import load_dotenv
-import re
 import time
 import asyncio
-import requests
-from io import BytesIO
-from PIL import Image
 from datetime import datetime, timedelta
 import heapq
 import json
+import math
 import random
-
-# Download required NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
+from .mastodon_async import AsyncMastodonClient
+from src.agent.draft_pool import Draft, DraftPool
+from src.agent.llm_cache import LLMResponseCache
+from src.agent.llm_backend import LLMBackend, create_llm_backend
+from src.agent.llm_client import AsyncLLMClient
+from src.agent.model_registry import StyleModelRegistry
+from src.agent.token_meter import TokenBudgetExceeded, get_token_meter
+from src.agent.structured_output import StyledPost, parse_styled_post, render_styled_post, styled_post_format
+from src.utils.retry import RetryPolicy
+from src.utils.scheduler import PriorityScheduler
+from src.utils.fanout import first_accepted
+from src.utils.cache import AsyncTTLCache
+from src.utils.media import get_media_fetcher
+from src.utils.seen_index import SeenIndex
+from src.utils.state_store import StateStore
+from src.utils.text import extract_keywords
+from src.utils.html_text import StatusTextCache
+from src.utils.minhash import MinHashIndex
+from src.listener.mastodon_stream import MastodonStreamListener, StreamUnavailable
 
 class PostStyle:
     MEME = "meme"
@@ -28,8 +36,20 @@ class PostStyle:
     STORYTELLER = "storyteller"
     ANALYST = "analyst"
 
+class TrendingPosts(list):
+    """Trending posts plus partial-failure information from the tag fan-out"""
+    def __init__(self, posts=(), tags=None, failed_tags=None):
+        super().__init__(posts)
+        self.tags = tags or []
+        self.failed_tags = failed_tags or []
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.failed_tags)
+
 class MastodonPlatform:
-    def __init__(self, credentials):
+    def __init__(self, credentials, max_io_workers: int = 8, ingestion_mode: str = 'polling',
+                 llm_backend: Optional[LLMBackend] = None):
         # Initialize Mastodon client
         self.client = Mastodon(
             client_id=credentials['client_id'],
@@ -37,42 +57,151 @@ class MastodonPlatform:
             access_token=credentials['access_token'],
             api_base_url=credentials['instance_url']
         )
+        # All API calls go through the async facade so network waits
+        # never block the event loop
+        self.api = AsyncMastodonClient(self.client, max_workers=max_io_workers)
+
+        # Read-through cache for slow-changing endpoints (TTL in seconds)
+        self.api_cache = AsyncTTLCache(default_ttl=60)
+        self.cache_ttls = {
+            'account_verify_credentials': 3600,
+            'instance': 3600,
+            'trending_tags': 300
+        }
+        self.access_token = credentials['access_token']
         
-        # Initialize Gemini model
-        if 'gemini_api_key' not in credentials:
+        # Trending tag fan-out used by auto-like and platform-trend posts;
+        # candidate_width platform-trend posts are drafted concurrently
+        self.trending_settings = {
+            'tag_count': 5,
+            'posts_per_tag': 2,
+            'concurrency': 5,
+            'candidate_width': 3
+        }
+        
+        # Shared pooled downloader for media attachments
+        self.media = get_media_fetcher()
+        
+        # Initialize Gemini model (or an offline backend for load tests)
+        self.llm_backend = llm_backend or create_llm_backend()
+        if self.llm_backend.requires_api_key and 'gemini_api_key' not in credentials:
             raise ValueError("Gemini API key is required")
-        genai.configure(api_key=credentials['gemini_api_key'])
+        self.llm_backend.configure(api_key=credentials.get('gemini_api_key'))
+        # Cursors, counters, trend tracking, recent posts, DM context and
+        # cached model responses live in one SQLite store whose writes are
+        # batched off the event loop
+        self.state = StateStore('agent_state.db')
+        # Responses to deterministic prompts are reused for a per-call-site
+        # TTL (seconds); creative generations are never cached
+        self.llm_cache = LLMResponseCache(self.state)
+        self.llm_cache_ttls = {
+            'internet_trends': 1800
+        }
+        # Token budgets per service; low-priority work is deferred near the
+        # cap so it can't starve mentions and DMs. The meter is shared with
+        # every other LLM client in the process (research, sentiment, ...).
+        self.token_meter = get_token_meter(self.state)
+        self.token_meter.budgets.update({
+            'mentions': {'hourly': 40000, 'daily': 300000, 'priority': 'high'},
+            'dm': {'hourly': 40000, 'daily': 300000, 'priority': 'high'},
+            'hashtag': {'hourly': 20000, 'daily': 150000, 'priority': 'low'},
+            'auto_post': {'hourly': 20000, 'daily': 100000, 'priority': 'low'},
+            'research': {'hourly': 10000, 'daily': 50000, 'priority': 'low'},
+            'sentiment': {'hourly': 10000, 'daily': 50000, 'priority': 'low'},
+            'analysis': {'hourly': 10000, 'daily': 50000, 'priority': 'low'},
+            'threads': {'hourly': 10000, 'daily': 50000, 'priority': 'low'},
+            'entertainment': {'hourly': 20000, 'daily': 100000, 'priority': 'high'}
+        })
+        self.token_budgets = self.token_meter.budgets
         try:
-            self.model = genai.GenerativeModel('gemini-1.5-flash-latest')
-            self.chat = self.model.start_chat(history=[])
+            self.model = self.llm_backend.create_model('gemini-1.5-flash-latest')
+            # Model calls are awaited through the shared bounded LLM pool
+            self.llm = AsyncLLMClient(self.model, cache=self.llm_cache, meter=self.token_meter)
         except Exception as e:
             raise Exception(f"Failed to initialize Gemini model: {str(e)}")
         
+        # The trends chat keeps a bounded window of recent turns (older ones
+        # are summarized), so its context stays the same size over time
+        self.chat_settings = {
+            'max_turns': 6,
+            'max_tokens': 4000,
+            'summarize': True
+        }
+        self.chat = self.llm.start_chat(**self.chat_settings)
+        
+        # Concurrent model requests (shared by every LLM consumer) and per-call timeout
+        self.llm_settings = {
+            'max_in_flight': self.llm.pool.max_in_flight,
+            'timeout': self.llm.pool.timeout
+        }
+        # Retry budgets per call site: replies wait less than scheduled posts
+        self.retry_settings = {
+            'reply': {'max_attempts': 3, 'base_delay': 1.0, 'max_delay': 20.0, 'max_total_delay': 40.0},
+            'post': {'max_attempts': 4, 'base_delay': 2.0, 'max_delay': 60.0, 'max_total_delay': 120.0}
+        }
+        self.retry_policies = {name: RetryPolicy(**budget) for name, budget in self.retry_settings.items()}
+        
+        # Every service runs its work items through one priority scheduler:
+        # replies to people first, then hashtag replies, then our own posts
+        # and likes, and drafts of future posts only in otherwise idle slots.
+        # Waiting work moves up one level per `aging` seconds.
+        self.scheduler_settings = {
+            'workers': 4,
+            'aging': 60.0,
+            'priorities': {'mention': 0, 'dm': 0, 'hashtag': 1, 'auto_post': 2, 'auto_like': 2, 'draft': 3}
+        }
+        self.scheduler = PriorityScheduler(
+            self.scheduler_settings['priorities'],
+            workers=self.scheduler_settings['workers'],
+            aging=self.scheduler_settings['aging']
+        )
+        
         # Initialize settings
         self.hashtags = []
         self.check_interval = 60
         self.cooldown_period = 5
-        self.processed_posts = set()
-        self.processed_dms = set()
+        # Statuses already replied to (hashtag posts, mentions and DMs),
+        # shared by every service and persisted across restarts
+        self.seen = SeenIndex('seen_status_ids.bin')
         self.last_post_time = time.time()
-        self.post_count = 0
-        self.last_daily_reset = time.time()
-        
-        # Initialize rate limiting attributes
-        self.last_request_time = time.time()
-        self.request_count = 0
-        self.max_requests_per_minute = 30
+        self._import_legacy_state()
+        if self.state.get_counter('last_daily_reset', None) is None:
+            self.last_daily_reset = time.time()
+        # Near-duplicate index over everything we have ever posted
+        self.post_index = MinHashIndex(self.state)
+        if not len(self.post_index):
+            self.post_index.update(self.state.recent_posts())
+        # Upcoming scheduled posts are generated ahead of time so they go out
+        # on schedule; drafts expire after max_age or once their topics stop
+        # trending, so only posts due within max_age are drafted
+        self.draft_settings = {
+            'enabled': True,
+            'size': 2,
+            'max_age': 3600,
+            'refill_interval': 60,
+            'trend_window': 10
+        }
+        self.draft_pool = DraftPool(
+            self.post_index,
+            size=self.draft_settings['size'],
+            max_age=self.draft_settings['max_age']
+        )
         
         # Initialize auto-like attributes
         self.last_like_reset = time.time()
         self.likes_count = 0
+        self.last_like_batch = {}
+        self.last_dm_batch = {}
+        self.last_candidate_batch = {}
+        self.liked = SeenIndex('liked_status_ids.bin')
         
         # Service status tracking
         self.services_status = {
             'auto_post': False,
             'dm': False,
             'auto_like': False,
-            'hashtag': False
+            'hashtag': False,
+            'mention': False
         }
         
         # Settings
@@ -85,13 +214,20 @@ class MastodonPlatform:
         self.dm_settings = {
             'enabled': False,
             'auto_reply': True,
-            'reply_interval': 300
+            'reply_interval': 300,
+            'workers': 4,
+            'max_pages': 10
+        }
+        
+        self.mention_settings = {
+            'enabled': True
         }
         
         self.like_settings = {
             'enabled': False,
             'max_likes_per_hour': 20,
-            'like_probability': 0.7
+            'like_probability': 0.7,
+            'workers': 4
         }
         
         self.post_config = {
@@ -103,11 +239,19 @@ class MastodonPlatform:
         
         # Initialize current style
         self.current_style = PostStyle.ENTERTAINER
+        # Per-style model handles (style preamble as system instruction, tuned sampling)
+        self.style_models = StyleModelRegistry(
+            self.llm_backend,
+            self.model.model_name,
+            max_length=self.post_config['max_length'],
+            pool=self.llm.pool,
+            cache=self.llm_cache,
+            retry=self.llm.retry,
+            meter=self.token_meter
+        )
         
-        # Initialize DM context file path
-        self.dm_context_file = 'dm_context.json'
-        self.replied_dms = set()
-        self._load_dm_context()
+        # Replied DM IDs used to live in dm_context.json
+        self._import_legacy_ids('dm_context.json', self.seen)
         
         # Initialize last auto post time
         self.last_auto_post_time = time.time()
@@ -115,42 +259,38 @@ class MastodonPlatform:
         
         self.platform_trends_used_today = False
         self.last_platform_trends_reset = time.time()
-        self.trends_tracking_file = "platform_trends_tracking.json"
         self._load_trends_tracking()
         
-        self.last_posts_cache = []
-        self.last_posts_file = "last_posts_cache.json"
-        self._load_last_posts()
-
-    def _clean_html(self, text: str) -> str:
-        """Remove HTML tags and clean up text"""
-        clean_text = re.sub(r'<[^>]+>', '', text)
-        clean_text = re.sub(r'http\S+|www.\S+', '', clean_text)
-        clean_text = ' '.join(clean_text.split())
-        return clean_text
-
-    async def _handle_rate_limit(self):
-        """Handle API rate limiting"""
-        current_time = time.time()
-        time_diff = current_time - self.last_request_time
-        
-        # Reset counter after a minute
-        if time_diff >= 60:
-            self.request_count = 0
-            self.last_request_time = current_time
-        
-        # If we're at the limit, wait
-        if self.request_count >= self.max_requests_per_minute:
-            wait_time = 60 - time_diff
-            if wait_time > 0:
-                print(f"Rate limit reached, waiting {wait_time:.1f} seconds...")
-                await asyncio.sleep(wait_time)
-                self.request_count = 0
-                self.last_request_time = time.time()
+        # 'streaming' pushes hashtag, mention and DM events as they happen;
+        # 'polling' (or a failed stream) falls back to the cursor-based loops
+        self.ingestion_settings = {
+            'mode': ingestion_mode,
+            'max_failures': 5,
+            'backoff_max': 300,
+            'max_attempts': 3
+        }
+        self.stream_listeners = {}
+        # Cursors stay on a failed hashtag post or mention until it is replied
+        # to or has failed max_attempts times; streamed events then catch up by polling
+        self.failed_attempts = {}
+        self.cursor_holds = set()
         
-        # Add small delay between requests
-        await asyncio.sleep(2)  # Add 2-second delay between requests
-        self.request_count += 1
+        # Statuses are seen by several services; convert their HTML once
+        self.status_text = StatusTextCache()
+
+    def _status_text(self, status: Dict) -> Dict:
+        """Get a status' plain text, mentions and hashtags, parsed once per status"""
+        return self.status_text.get(status)
+
+    async def _cached_call(self, endpoint: str, *args, **kwargs):
+        """Call a read endpoint through the TTL cache, sharing in-flight requests"""
+        key = (endpoint, args, tuple(sorted(kwargs.items())))
+
+        return await self.api_cache.get_or_fetch(
+            key,
+            lambda: getattr(self.api, endpoint)(*args, **kwargs),
+            ttl=self.cache_ttls.get(endpoint)
+        )
 
     def _get_media_attachments(self, status: Dict) -> List[Dict]:
         """Extract media attachments from status"""
@@ -169,26 +309,25 @@ class MastodonPlatform:
             print(f"Error processing media attachments: {str(e)}")
             return []
 
-    async def _download_image(self, url: str) -> Optional[Image.Image]:
-        """Download and process image from URL"""
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            return Image.open(BytesIO(response.content))
-        except Exception as e:
-            print(f"Error downloading image: {str(e)}")
-            return None
+    async def generate_entertainment_response(self, post_text: str, status: Dict = None, retry: str = 'reply',
+                                              cache_ttl: Optional[float] = None, service: Optional[str] = None) -> str:
+        """Generate a short, fun response using Gemini, including image analysis if present
 
-    async def generate_entertainment_response(self, post_text: str, status: Dict = None, max_retries=3) -> str:
-        """Generate a short, fun response using Gemini, including image analysis if present"""
-        clean_text = self._clean_html(post_text)
+        Transient model errors are retried under the named retry budget.
+        Text-only prompts are served from the response cache when cache_ttl is given.
+        Tokens are metered against the service; deferred work raises TokenBudgetExceeded.
+        post_text is plain text (statuses go through _status_text first), so it
+        is not run through the HTML converter again.
+        """
+        clean_text = ' '.join(post_text.split())
         
         # Get media attachments if status is provided
         images = []
         if status:
             media_attachments = self._get_media_attachments(status)
-            for media in media_attachments:
-                if image := await self._download_image(media['url']):
+            downloaded = await self.media.fetch_images([media['url'] for media in media_attachments])
+            for media, image in zip(media_attachments, downloaded):
+                if image:
                     images.append({
                         'image': image,
                         'description': media['description']
@@ -213,92 +352,117 @@ class MastodonPlatform:
         Format: Just the response text with emojis.
         """
         
-        for attempt in range(max_retries):
-            try:
-                await asyncio.sleep(5)  # Wait 5 seconds between attempts
-                
-                if images:
-                    # Use multimodal generation if images are present
-                    generation_config = {
-                        'temperature': 0.7,
-                        'top_p': 0.8,
-                        'top_k': 40
-                    }
-                    
-                    # Create a list of content parts for multimodal input
-                    content_parts = [prompt]
-                    for img_data in images:
-                        content_parts.append(img_data['image'])
-                        if img_data['description']:
-                            content_parts.append(f"Image description: {img_data['description']}")
-                    
-                    response = self.model.generate_content(
-                        content_parts,
-                        generation_config=generation_config
-                    )
-                else:
-                    # Text-only generation
-                    response = self.model.generate_content(prompt)
+        retry_policy = self.retry_policies.get(retry)
+        try:
+            if images:
+                # Use multimodal generation if images are present
+                generation_config = {
+                    'temperature': 0.7,
+                    'top_p': 0.8,
+                    'top_k': 40
+                }
                 
-                return response.text[:240].strip()  # Maintain character limit
+                # Create a list of content parts for multimodal input
+                content_parts = [prompt]
+                for img_data in images:
+                    content_parts.append(img_data['image'])
+                    if img_data['description']:
+                        content_parts.append(f"Image description: {img_data['description']}")
                 
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = 10 * (attempt + 1)
-                    print(f"Retry {attempt + 1}/{max_retries} after {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    print(f"Error generating response: {str(e)}")
-                    return "✨ Interesting perspective! Thanks for sharing! 🌟"
-
-    async def search_hashtag(self, hashtag: str, limit: int = 5) -> List[Dict]:
-        """Search for posts with specific hashtag"""
+                response = await self.llm.generate(
+                    content_parts,
+                    generation_config=generation_config,
+                    retry=retry_policy,
+                    service=service
+                )
+            else:
+                # Text-only generation
+                response = await self.llm.generate(prompt, cache_ttl=cache_ttl, retry=retry_policy, service=service)
+            
+            return response.text[:240].strip()  # Maintain character limit
+            
+        except TokenBudgetExceeded as e:
+            if e.action == 'defer':
+                raise
+            print(f"⚠️ {str(e)}, replying without the model")
+            return "✨ Interesting perspective! Thanks for sharing! 🌟"
+        except Exception as e:
+            print(f"Error generating response: {str(e)}")
+            return "✨ Interesting perspective! Thanks for sharing! 🌟"
+
+    async def search_hashtag(self, hashtag: str, limit: int = 5, incremental: bool = False,
+                             raise_errors: bool = False) -> List[Dict]:
+        """Search for posts with specific hashtag
+
+        With incremental=True only posts newer than the saved cursor for this
+        hashtag are fetched, oldest first. The cursor only advances past posts
+        that need no reply; callers advance it past each returned post (to its
+        'cursor_id' when skipped posts follow it) once they are handled.
+        With raise_errors=True a failed lookup raises instead of returning [].
+        """
         try:
             print(f"🔍 Searching posts with #{hashtag}...")
             # Remove # if present
             hashtag = hashtag.strip('#')
+            cursor_key = f"hashtag:{hashtag.lower()}"
+            since_id = self.state.get_cursor(cursor_key) if incremental else None
             
             # Get posts with hashtag
             results = []
-            posts = self.client.timeline_hashtag(hashtag)
+            if since_id is not None:
+                posts = await self.api.timeline_hashtag(
+                    hashtag, min_id=since_id, limit=limit
+                )
+                # Oldest first so the cursor never jumps past unread posts
+                posts = sorted(posts, key=lambda p: int(p['id']))[:limit]
+            else:
+                posts = await self.api.timeline_hashtag(hashtag)
+                # First poll: only the newest posts, skipping the backlog, but
+                # still oldest first so the cursor moves as they are handled
+                posts = sorted(posts, key=lambda p: int(p['id']))[-limit:]
+            own_id = (await self._cached_call('account_verify_credentials'))['id']
             
-            for post in posts[:limit]:
+            for post in posts:
                 try:
-                    # Skip posts we've already processed
-                    if post['id'] in self.processed_posts:
-                        continue
-                        
-                    # Skip our own posts
-                    if post['account']['id'] == self.client.account_verify_credentials()['id']:
+                    # Skip posts we've already processed and our own posts
+                    if post['id'] in self.seen or post['account']['id'] == own_id:
+                        if incremental and not results:
+                            # Nothing unhandled before it, so the cursor can pass it
+                            self.state.advance_cursor(cursor_key, post['id'])
+                        elif incremental:
+                            # ...or it can once the posts before it are handled
+                            results[-1]['cursor_id'] = post['id']
                         continue
                         
-                    # Extract post info
-                    post_info = {
-                        'id': post['id'],
-                        'content': self._clean_html(post['content']),
-                        'author': post['account']['username'],
-                        'created_at': post['created_at'],
-                        'raw_status': post  # Keep original status for reference
-                    }
-                    
-                    results.append(post_info)
+                    results.append(self._to_post_info(post))
                     
                 except Exception as e:
                     print(f"❌ Error processing hashtag result: {str(e)}")
                     continue
-                    
+            
             print(f"✅ Found {len(results)} new posts with #{hashtag}")
             return results
             
         except Exception as e:
             print(f"❌ Error searching hashtag #{hashtag}: {str(e)}")
+            if raise_errors:
+                raise
             return []
 
+    def _to_post_info(self, post: Dict) -> Dict:
+        """Extract the post info consumed by process_single_post"""
+        return {
+            'id': post['id'],
+            'content': self._status_text(post)['text'],
+            'author': post['account']['username'],
+            'created_at': post['created_at'],
+            'raw_status': post  # Keep original status for reference
+        }
+
     async def reply_to_post(self, post_id: str, content: str) -> Dict:
-        """Post a reply with rate limiting"""
+        """Post a reply"""
         try:
-            await self._handle_rate_limit()
-            status = self.client.status_post(
+            status = await self.api.status_post(
                 content,
                 in_reply_to_id=post_id,
                 visibility="public"
@@ -311,43 +475,54 @@ class MastodonPlatform:
     def _format_post(self, status: Dict) -> Dict:
         """Format post with key information including raw status for media processing"""
         try:
-            clean_content = self._clean_html(status['content'])
-            
-            tokens = word_tokenize(clean_content.lower())
-            stop_words = set(stopwords.words('english'))
-            keywords = [word for word in tokens 
-                       if word.isalnum() and word not in stop_words][:5]
-            
-            return {
-                "id": status['id'],
-                "content": clean_content,
-                "author": status['account']['acct'],
-                "keywords": keywords,
-                "created_at": status['created_at'],
-                "raw_status": status  # Include raw status for media processing
-            }
+            parsed = self._status_text(status)
+            return self._post_dict(status, parsed, extract_keywords(parsed['text']))
         except Exception as e:
             print(f"Error formatting post: {str(e)}")
             return {"error": str(e)}
 
+    def _post_dict(self, status: Dict, parsed: Dict, keywords: List[str]) -> Dict:
+        return {
+            "id": status['id'],
+            "content": parsed['text'],
+            "author": status['account']['acct'],
+            "keywords": keywords,
+            "mentions": parsed['mentions'],
+            "hashtags": parsed['hashtags'],
+            "created_at": status['created_at'],
+            "raw_status": status  # Include raw status for media processing
+        }
+
     async def get_mentions(self, limit: int = 3) -> List[Dict]:
-        """Get recent mentions with rate limiting"""
+        """Get recent mentions"""
         try:
-            await self._handle_rate_limit()
-            mentions = self.client.notifications(
+            mentions = await self.api.notifications(
                 types=['mention'],
-                limit=limit
+                limit=limit,
+                min_id=self.state.get_cursor('notifications:mention')
             )
             
             responses = []
-            for mention in mentions:
-                mention_data = self._format_post(mention['status'])
+            # Oldest first so the cursor only moves past handled mentions; a
+            # failed mention holds it there so the next poll retries it
+            mentions = sorted(mentions, key=lambda n: int(n['id']))
+            formatted = [self._format_post(mention['status']) for mention in mentions]
+            caught_up = True
+            for mention, mention_data in zip(mentions, formatted):
                 response = await self.handle_mention(mention['status'])
                 responses.append({
                     "mention": mention_data,
                     "response": response
                 })
-                                                                                                                                                                                                                        
+                if not self._is_handled('notifications:mention', mention['id'], response):
+                    if caught_up:
+                        self._hold_cursor('notifications:mention', mention['id'])
+                    caught_up = False
+                if caught_up:
+                    self.state.advance_cursor('notifications:mention', mention['id'])
+            if caught_up:
+                self.cursor_holds.discard('notifications:mention')
+            
             return responses
         except Exception as e:
             print(f"Error getting mentions: {str(e)}")
@@ -355,10 +530,18 @@ class MastodonPlatform:
 
     async def handle_mention(self, mention: Dict) -> Dict:
         """Handle mentions with rate limiting"""
+        return await self.scheduler.run('mention', lambda: self._handle_mention(mention))
+
+    async def _handle_mention(self, mention: Dict) -> Dict:
         try:
+            if mention['id'] in self.seen:
+                return {"status": "skipped", "reason": "already replied"}
             post = self._format_post(mention)
-            response = await self.generate_entertainment_response(post['content'])
+            response = await self.generate_entertainment_response(post['content'], service='mentions')
             reply = await self.reply_to_post(post['id'], response)
+            if 'error' in reply:
+                return {"error": reply['error'], "response": response}
+            self.seen.add(mention['id'])
             
             return {
                 "status": "success",
@@ -371,14 +554,21 @@ class MastodonPlatform:
 
     async def process_single_post(self, post: Dict):
         """Process a single post including any images"""
+        return await self.scheduler.run('hashtag', lambda: self._process_single_post(post))
+
+    async def _process_single_post(self, post: Dict):
         try:
             response = await self.generate_entertainment_response(
                 post['content'],
-                status=post['raw_status']  # Pass the original status object
+                status=post['raw_status'],  # Pass the original status object
+                service='hashtag'
             )
             
             reply = await self.reply_to_post(post['id'], response)
             return reply
+        except TokenBudgetExceeded:
+            # Deferred, not failed: the caller keeps the post for the next window
+            raise
         except Exception as e:
             print(f"Error processing post: {str(e)}")
             return {"error": str(e)}
@@ -397,36 +587,56 @@ class MastodonPlatform:
                 print(f"Error in auto-posting loop: {str(e)}")
                 await asyncio.sleep(300)  # Wait 5 minutes on error
 
-    async def get_trending_posts(self, limit: int = 10) -> List[Dict]:
-        """Get trending posts from the instance with enhanced error handling and rate limiting"""
+    async def get_trending_posts(self, limit: int = 10) -> "TrendingPosts":
+        """Get trending posts from the instance's top trending tags
+
+        Tags are searched concurrently (bounded by trending_settings['concurrency']),
+        results are deduplicated by status ID, and tags whose lookup failed are
+        reported on the returned list's failed_tags.
+        """
         try:
-            await self._handle_rate_limit()
-            trending = self.client.trending_tags()
-            posts = []
+            trending = await self._cached_call('trending_tags')
+            tags = [tag['name'] for tag in trending[:self.trending_settings['tag_count']]]
+            semaphore = asyncio.Semaphore(self.trending_settings['concurrency'])
             
-            # Get posts from top trending tags with better error handling
-            for tag in trending[:5]:
-                try:
-                    results = await self.search_hashtag(tag['name'], limit=2)
-                    if results:
-                        posts.extend(results)
-                except Exception as tag_error:
-                    print(f"Error fetching posts for tag {tag['name']}: {str(tag_error)}")
+            async def fetch(tag):
+                async with semaphore:
+                    return await self.search_hashtag(
+                        tag,
+                        limit=self.trending_settings['posts_per_tag'],
+                        raise_errors=True
+                    )
+            
+            results = await asyncio.gather(*[fetch(tag) for tag in tags], return_exceptions=True)
+            
+            posts = {}
+            failed_tags = []
+            for tag, result in zip(tags, results):
+                if isinstance(result, BaseException):
+                    print(f"Error fetching posts for tag {tag}: {str(result)}")
+                    failed_tags.append(tag)
                     continue
+                for post in result:
+                    # The same status often carries several trending tags
+                    merged = posts.setdefault(post['id'], dict(post, source_tags=[]))
+                    merged['source_tags'].append(tag)
             
-            # Enhanced sorting with fallback for missing metrics
-            sorted_posts = sorted(posts,
-                key=lambda x: (x.get('favourites_count', 0) + x.get('reblogs_count', 0) + 
-                             x.get('replies_count', 0)),
-                reverse=True)
+            def engagement(post):
+                status = post['raw_status']
+                return (status.get('favourites_count', 0) + status.get('reblogs_count', 0) +
+                        status.get('replies_count', 0))
             
-            return sorted_posts[:limit]
+            sorted_posts = sorted(posts.values(), key=engagement, reverse=True)
+            return TrendingPosts(sorted_posts[:limit], tags=tags, failed_tags=failed_tags)
         except Exception as e:
             print(f"Error getting trending posts: {str(e)}")
-            return []
+            return TrendingPosts(failed_tags=['*'])
 
     async def create_trending_post(self):
         """Create an engaging post based on trending content with improved analysis"""
+        return await self.scheduler.run('auto_post', self._create_trending_post)
+
+    async def _create_trending_post(self):
         try:
             # Reset platform trends flag at midnight
             current_time = time.time()
@@ -473,7 +683,8 @@ class MastodonPlatform:
         """Create post based on previous high-engagement content"""
         try:
             # Get our recent posts with engagement metrics
-            recent_posts = self.client.account_statuses(self.client.me())
+            me = await self._cached_call('account_verify_credentials')
+            recent_posts = await self.api.account_statuses(me)
             if not recent_posts:
                 return await self._create_platform_trends_post()
 
@@ -493,15 +704,15 @@ class MastodonPlatform:
             5. Keeps optimal length (180-240 characters)
             """
 
-            response = await self.generate_entertainment_response(prompt)
+            response = await self.generate_entertainment_response(prompt, retry='post', service='auto_post')
             
-            await self._handle_rate_limit()
-            status = self.client.status_post(
+            status = await self.api.status_post(
                 response,
                 visibility="public",
                 language=top_post.get('language', 'en'),
                 sensitive=top_post.get('sensitive', False)
             )
+            self._remember_post(response)
             
             return self._format_post(status)
 
@@ -516,7 +727,14 @@ class MastodonPlatform:
             prompt = """What are the top 3 trending topics on the internet right now? 
             Provide brief context for each trend. Format as: Topic: Context"""
             
-            response = await self.chat.send_message(prompt)
+            # The question never changes, so one answer serves every trends
+            # post within the TTL
+            response = await self.chat.send_message(
+                prompt,
+                cache_ttl=self.llm_cache_ttls.get('internet_trends'),
+                retry=self.retry_policies['post'],
+                service='auto_post'
+            )
             trends = response.text
 
             # Create post about one of the trends
@@ -532,13 +750,13 @@ class MastodonPlatform:
             5. Maintains optimal length (180-240 characters)
             """
 
-            post_content = await self.generate_entertainment_response(post_prompt)
+            post_content = await self.generate_entertainment_response(post_prompt, retry='post', service='auto_post')
             
-            await self._handle_rate_limit()
-            status = self.client.status_post(
+            status = await self.api.status_post(
                 post_content,
                 visibility="public"
             )
+            self._remember_post(post_content)
             
             return self._format_post(status)
 
@@ -553,8 +771,7 @@ class MastodonPlatform:
             if not trending_posts:
                 return None
             
-            # Try each trending post until finding one that's not too similar to recent posts
-            for trending_post in trending_posts:
+            def make_call(trending_post):
                 prompt = f"""
                 Based on this trending Mastodon topic:
                 {trending_post['content']}
@@ -566,26 +783,38 @@ class MastodonPlatform:
                 4. Includes appropriate emojis
                 5. Maintains optimal length (180-240 characters)
                 """
+                return lambda: self.generate_entertainment_response(prompt, retry='post', service='auto_post')
+            
+            # Draft candidates from several trending posts at once and take the
+            # first that isn't too similar to recent posts; the rest are cancelled
+            started = time.perf_counter()
+            batch = {'width': self._candidate_width(), 'candidates': len(trending_posts)}
+            accepted = await first_accepted(
+                [make_call(trending_post) for trending_post in trending_posts],
+                lambda response: not self._is_post_recent(response),
+                width=batch['width'],
+                stats=batch
+            )
+            batch['accepted'] = accepted is not None
+            batch['elapsed'] = round(time.perf_counter() - started, 3)
+            self.last_candidate_batch = batch
+            print(f"🧪 Candidates: {batch['started']}/{batch['candidates']} drafted, "
+                  f"{batch['rejected']} too similar, {batch['cancelled']} cancelled in {batch['elapsed']}s")
+            
+            if accepted:
+                index, response = accepted
+                trending_post = trending_posts[index]
+                # Add to history before posting
+                self._remember_post(response)
                 
-                response = await self.generate_entertainment_response(prompt)
+                status = await self.api.status_post(
+                    response,
+                    visibility="public",
+                    language=trending_post.get('language', 'en'),
+                    sensitive=trending_post.get('sensitive', False)
+                )
                 
-                # Check if the generated content is too similar to recent posts
-                if not self._is_post_recent(response):
-                    # Add to cache before posting
-                    self.last_posts_cache.append(response)
-                    if len(self.last_posts_cache) > 5:
-                        self.last_posts_cache.pop(0)
-                    self._save_last_posts()
-                    
-                    await self._handle_rate_limit()
-                    status = self.client.status_post(
-                        response,
-                        visibility="public",
-                        language=trending_post.get('language', 'en'),
-                        sensitive=trending_post.get('sensitive', False)
-                    )
-                    
-                    return self._format_post(status)
+                return self._format_post(status)
             
             # If all trending posts were too similar, fall back to internet trends
             return await self._create_internet_trends_post()
@@ -594,6 +823,10 @@ class MastodonPlatform:
             print(f"Error in platform trends post: {str(e)}")
             return None
 
+    def _candidate_width(self) -> int:
+        """Concurrent candidate drafts, leaving one LLM slot free for replies"""
+        return max(1, min(self.trending_settings['candidate_width'], self.llm.pool.max_in_flight - 1))
+
     async def schedule_auto_posts(self):
         """Main loop for scheduled auto-posting"""
         print("\n🚀 Starting auto-posting service...")
@@ -610,6 +843,9 @@ class MastodonPlatform:
                 else:
                     print("❌ Failed to create initial post, will retry in regular interval")
 
+            # Draft upcoming posts in the background between publish times
+            drafts = asyncio.create_task(self.maintain_draft_pool())
+
             # Continue with regular posting schedule
             while True:
                 try:
@@ -641,10 +877,12 @@ class MastodonPlatform:
                             print("⏳ Daily post limit reached, waiting for reset")
                             await asyncio.sleep(self._time_until_next_reset())
                     
-                    await asyncio.sleep(60)  # Check every minute
+                    # Check every minute, or wake up exactly when the next post is due
+                    await asyncio.sleep(self._time_until_next_post())
                     
                 except asyncio.CancelledError:
                     print("🛑 Auto-posting service stopped")
+                    drafts.cancel()
                     break
                 except Exception as e:
                     print(f"❌ Error in auto-posting loop: {str(e)}")
@@ -666,17 +904,69 @@ class MastodonPlatform:
         seconds_since_midnight = now.tm_hour * 3600 + now.tm_min * 60 + now.tm_sec
         return 86400 - seconds_since_midnight  # Seconds until midnight
 
+    def _next_post_due(self) -> Optional[float]:
+        """Seconds until the next scheduled post is due, or None if no more are posted today"""
+        if (not self.auto_post_settings['enabled'] or
+                self.post_count >= self.auto_post_settings['max_daily_posts']):
+            return None
+        return self.last_post_time + self.auto_post_settings['interval'] - time.time()
+
+    def _time_until_next_post(self):
+        """Seconds until the next scheduled post is due, between one second and a minute"""
+        due = self._next_post_due()
+        return 60 if due is None else min(max(due, 1), 60)
+
+    def _drafts_wanted(self) -> int:
+        """Number of upcoming posts due before a draft made now would expire"""
+        due = self._next_post_due()
+        if due is None:
+            return 0
+        # Posts can go out up to a minute after they are due
+        lifetime = self.draft_pool.max_age - max(due, 0) - 60
+        if lifetime <= 0:
+            return 0
+        interval = max(self.auto_post_settings['interval'], 1)
+        remaining_today = self.auto_post_settings['max_daily_posts'] - self.post_count
+        return min(math.ceil(lifetime / interval), remaining_today)
+
+    async def maintain_draft_pool(self):
+        """Keep the draft pool filled while auto-posting runs"""
+        while True:
+            try:
+                if self.auto_post_settings['enabled'] and self.draft_settings['enabled']:
+                    await self.fill_draft_pool()
+                await asyncio.sleep(self.draft_settings['refill_interval'])
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"❌ Error filling draft pool: {str(e)}")
+                await asyncio.sleep(300)
+
+    async def fill_draft_pool(self) -> int:
+        """Draft scheduled posts (in idle scheduler slots) for the posts due within max_age"""
+        needed = self.draft_pool.needed(self._drafts_wanted())
+        added = 0
+        for _ in range(needed):
+            try:
+                draft = await self.scheduler.run('draft', self._generate_scheduled_post)
+            except TokenBudgetExceeded as e:
+                print(f"⏸️ Not drafting posts: {str(e)}")
+                break
+            if draft is None or not self.draft_pool.add(draft):
+                break
+            added += 1
+            print(f"📦 Drafted post {len(self.draft_pool)}/{self.draft_pool.size}: {draft.text}")
+        return added
+
     async def get_trending_topics(self, limit: int = 5) -> List[str]:
         """Get trending topics by analyzing recent public posts"""
         try:
-            await self._handle_rate_limit()
-            
             # Get trending tags directly from Mastodon API
-            trending_tags = self.client.trending_tags()
+            trending_tags = await self._cached_call('trending_tags')
             
             # Fallback to timeline analysis if trending tags API fails
             if not trending_tags:
-                timeline = self.client.timeline_public(limit=30)
+                timeline = await self.api.timeline_public(limit=30)
                 hashtag_counts = {}
                 for status in timeline:
                     tags = status.get('tags', [])
@@ -697,56 +987,32 @@ class MastodonPlatform:
 
     async def create_scheduled_post(self):
         """Create an engaging scheduled post with trending topics"""
+        return await self.scheduler.run('auto_post', self._create_scheduled_post)
+
+    async def _create_scheduled_post(self):
         try:
-            print("\n📊 Fetching trending topics...")
-            # Get current trending topics
-            trending_topics = await self.get_trending_topics(limit=3)
-            
-            if trending_topics:
-                topics_str = ', '.join(trending_topics)
-                print(f"📈 Found trending topics: {topics_str}")
-                prompt = f"""
-                Create an engaging social media post about these trending topics: {topics_str}
-                
-                Requirements:
-                - Focus on the most interesting aspects
-                - Add valuable insights or perspectives
-                - Include 1-2 relevant hashtags from: {topics_str}
-                - Use 1-2 appropriate emojis
-                - Keep it under {self.post_config['max_length']} characters
-                - Make it conversation-starting
-                """
+            draft = None
+            if self.draft_settings['enabled']:
+                # Drafts whose topics have dropped out of the trends are stale
+                trending = await self.get_trending_topics(limit=self.draft_settings['trend_window'])
+                draft = self.draft_pool.take(trending, style=self.current_style)
+            if draft:
+                print(f"📦 Using post drafted {draft.age():.0f}s ago")
             else:
-                # Fallback topics if no trending tags found
-                print("⚠️ No trending topics found, using fallback topics...")
-                topics = ['technology', 'digital culture', 'innovation', 
-                         'future tech', 'AI', 'social media']
-                selected_topics = random.sample(topics, 2)
-                print(f"🎲 Selected topics: {', '.join(selected_topics)}")
-                prompt = f"""
-                Create an engaging social media post about one of these topics: 
-                {', '.join(selected_topics)}
-                
-                Requirements:
-                - Be informative and engaging
-                - Add valuable insights
-                - Include 1-2 relevant hashtags
-                - Use 1-2 appropriate emojis
-                - Keep it under {self.post_config['max_length']} characters
-                - Make it conversation-starting
-                """
-            
-            # Generate post content using selected style
-            print("🤖 Generating post content...")
-            response = await self.create_styled_post(prompt, self.current_style)
+                draft = await self._generate_scheduled_post()
+                if draft is None:
+                    return None
+            response, post = draft.text, draft.post
             
             # Post the content
             print("📤 Posting content...")
-            await self._handle_rate_limit()
-            status = self.client.status_post(
+            status = await self.api.status_post(
                 response,
-                visibility="public"
+                visibility="public",
+                language=post.language,
+                sensitive=post.sensitive
             )
+            self._remember_post(response)
             
             formatted_post = self._format_post(status)
             print(f"\n✅ Successfully posted: {response}")
@@ -756,6 +1022,61 @@ class MastodonPlatform:
             print(f"❌ Error creating scheduled post: {str(e)}")
             return None
 
+    async def _generate_scheduled_post(self) -> Optional[Draft]:
+        """Generate a scheduled post about the current trending topics"""
+        print("\n📊 Fetching trending topics...")
+        # Get current trending topics
+        trending_topics = await self.get_trending_topics(limit=3)
+        
+        if trending_topics:
+            topics_str = ', '.join(trending_topics)
+            print(f"📈 Found trending topics: {topics_str}")
+            prompt = f"""
+            Create an engaging social media post about these trending topics: {topics_str}
+            
+            Requirements:
+            - Focus on the most interesting aspects
+            - Add valuable insights or perspectives
+            - Include 1-2 relevant hashtags from: {topics_str}
+            - Use 1-2 appropriate emojis
+            - Keep it under {self.post_config['max_length']} characters
+            - Make it conversation-starting
+            """
+        else:
+            # Fallback topics if no trending tags found
+            print("⚠️ No trending topics found, using fallback topics...")
+            topics = ['technology', 'digital culture', 'innovation', 
+                     'future tech', 'AI', 'social media']
+            selected_topics = random.sample(topics, 2)
+            print(f"🎲 Selected topics: {', '.join(selected_topics)}")
+            prompt = f"""
+            Create an engaging social media post about one of these topics: 
+            {', '.join(selected_topics)}
+            
+            Requirements:
+            - Be informative and engaging
+            - Add valuable insights
+            - Include 1-2 relevant hashtags
+            - Use 1-2 appropriate emojis
+            - Keep it under {self.post_config['max_length']} characters
+            - Make it conversation-starting
+            """
+        
+        # Generate post content using selected style, retrying unusable output
+        # and near-duplicates of past posts and of drafts waiting in the pool
+        print("🤖 Generating post content...")
+        style = self.current_style
+        for attempt in range(3):
+            post = await self.generate_styled_post(prompt, style)
+            if post is None:
+                continue
+            draft = self.draft_pool.make_draft(post, self._render_styled_post(post), trending_topics, style)
+            if not self.draft_pool.is_duplicate(draft):
+                return draft
+            print(f"♻️ Generated post is too similar to a past post (attempt {attempt + 1}/3)")
+        print("❌ Could not generate a usable post that isn't a near-duplicate")
+        return None
+
     async def set_post_style(self, style: str) -> bool:
         """Update the posting style"""
         if hasattr(PostStyle, style.upper()):
@@ -763,154 +1084,230 @@ class MastodonPlatform:
             return True
         return False
 
-    async def create_styled_post(self, content: str, style: str = None) -> str:
-        """Create a post with specific style"""
+    async def create_styled_post(self, content: str, style: str = None, retry: str = 'post',
+                                 service: str = 'auto_post') -> Optional[str]:
+        """Create a post with specific style, or None if the model output was unusable"""
+        post = await self.generate_styled_post(content, style, retry, service)
+        return self._render_styled_post(post) if post else None
+
+    async def generate_styled_post(self, content: str, style: str = None, retry: str = 'post',
+                                   service: str = 'auto_post') -> Optional[StyledPost]:
+        """Generate a styled post body, hashtags, language and sensitivity in one model call
+
+        Returns None when the model's output has no usable post text, so the
+        caller skips the post rather than publishing filler.
+        """
         if not style:
             style = self.current_style
 
-        style_prompts = {
-            PostStyle.MEME: """
-                Transform this into a meme-style post:
-                - Use internet humor
-                - Add trending references
-                - Include popular emojis
-                - Keep it light and funny
-                - Add meme-related hashtags
-            """,
-            PostStyle.ENTERTAINER: """
-                Create an entertaining post:
-                - Make it fun and engaging
-                - Use witty language
-                - Include relevant emojis
-                - Add pop culture references
-                - Keep it conversational
-            """,
-            PostStyle.INFORMATIVE: """
-                Create an informative post:
-                - Focus on facts
-                - Use clear language
-                - Add educational value
-                - Include relevant statistics
-                - Add topic-specific hashtags
-            """,
-            PostStyle.STORYTELLER: """
-                Transform this into a narrative-style post:
-                - Create a mini-story
-                - Build intrigue
-                - Use descriptive language
-                - End with a hook
-                - Add story-related hashtags
-            """,
-            PostStyle.ANALYST: """
-                Create an analytical post:
-                - Present data-driven insights
-                - Include trend analysis
-                - Use professional terminology
-                - Add relevant metrics
-                - Include industry hashtags
-            """
-        }
-
-        prompt = f"{style_prompts[style]}\n\nContent to transform: {content}"
+        prompt = f"Content to transform: {content}"
         
         # Apply length limit
         if self.post_config["max_length"]:
             prompt += f"\nKeep response under {self.post_config['max_length']} characters."
 
-        response = await self.generate_entertainment_response(prompt)
-        
-        # Add hashtags if enabled
-        if self.post_config["use_hashtags"]:
-            hashtags = await self._generate_relevant_hashtags(content)
-            if len(response) + len(hashtags) <= self.post_config["max_length"]:
-                response += f"\n{hashtags}"
-
-        return response
+        prompt += styled_post_format(3 if self.post_config["use_hashtags"] else 0)
 
-    async def _generate_relevant_hashtags(self, content: str, max_tags: int = 3) -> str:
-        """Generate relevant hashtags for the content"""
         try:
-            prompt = f"""
-            Generate {max_tags} relevant hashtags for this content: "{content}"
-            Rules:
-            - No spaces in hashtags
-            - Related to the main topic
-            - Trending if possible
-            - Return only the hashtags separated by spaces
-            """
-            
-            response = await self.generate_entertainment_response(prompt)
-            hashtags = ' '.join([tag if tag.startswith('#') else f'#{tag}' 
-                               for tag in response.split()[:max_tags]])
-            return hashtags
+            response = await self.style_models.get(style).generate_text(
+                self.style_models.prompt(style, prompt),
+                retry=self.retry_policies.get(retry),
+                service=service
+            )
+        except TokenBudgetExceeded as e:
+            if e.action == 'defer':
+                raise
+            print(f"⚠️ {str(e)}, replying without the model")
+            return StyledPost(body="✨ Interesting perspective! Thanks for sharing! 🌟")
         except Exception as e:
-            print(f"Error generating hashtags: {str(e)}")
-            return ""
-
-    def _load_dm_context(self):
-        """Load previously replied DM IDs from file"""
+            print(f"Error generating styled post: {str(e)}")
+            return StyledPost(body="✨ Interesting perspective! Thanks for sharing! 🌟")
         try:
-            if os.path.exists(self.dm_context_file):
-                with open(self.dm_context_file, 'r') as f:
-                    self.replied_dms = set(json.load(f))
-        except Exception as e:
-            print(f"Error loading DM context: {str(e)}")
-            self.replied_dms = set()
+            return parse_styled_post(response)
+        except ValueError as e:
+            print(f"⚠️ Skipping styled post, unusable model output: {str(e)}")
+            return None
+
+    def _render_styled_post(self, post: StyledPost) -> str:
+        """Post text for a styled post under the current post config"""
+        max_tags = 3 if self.post_config["use_hashtags"] else 0
+        return render_styled_post(post, self.post_config["max_length"], max_tags)
+
+    @property
+    def post_count(self) -> int:
+        return int(self.state.get_counter('post_count'))
+
+    @post_count.setter
+    def post_count(self, value: int):
+        self.state.set_counter('post_count', value)
+
+    @property
+    def last_daily_reset(self) -> float:
+        return self.state.get_counter('last_daily_reset', time.time())
+
+    @last_daily_reset.setter
+    def last_daily_reset(self, value: float):
+        self.state.set_counter('last_daily_reset', value)
+
+    def _import_legacy_state(self):
+        """Move cursors, trend tracking and recent posts from the old JSON files into the state store"""
+        for path in ('timeline_cursors.json', 'platform_trends_tracking.json', 'last_posts_cache.json'):
+            try:
+                if not os.path.exists(path):
+                    continue
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if path == 'timeline_cursors.json':
+                    for key, value in data.items():
+                        self.state.advance_cursor(key, value)
+                elif path == 'platform_trends_tracking.json':
+                    self.state.set_value('platform_trends', data)
+                else:
+                    for post in data:
+                        self.state.add_recent_post(post)
+                # Commit the imported rows before the JSON file is retired
+                self.state.flush()
+                os.replace(path, f"{path}.migrated")
+            except Exception as e:
+                print(f"Error importing {path}: {str(e)}")
+
+    def close(self):
+        """Close the state store and seen indexes (the platform is unusable afterwards)"""
+        self.state.close()
+        self.seen.close()
+        self.liked.close()
 
-    def _save_dm_context(self):
-        """Save replied DM IDs to file"""
+    def _import_legacy_ids(self, path: str, index: SeenIndex):
+        """Move IDs from an old JSON list file into a seen index"""
         try:
-            with open(self.dm_context_file, 'w') as f:
-                json.dump(list(self.replied_dms), f)
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    index.update(json.load(f))
+                os.replace(path, f"{path}.migrated")
         except Exception as e:
-            print(f"Error saving DM context: {str(e)}")
+            print(f"Error importing {path}: {str(e)}")
 
-    async def handle_direct_messages(self):
-        """Process and respond to DMs with style"""
+    async def handle_direct_messages(self) -> Dict:
+        """Process and respond to DMs with style
+
+        Conversations are paged newest-first until one we had already seen
+        on the previous sweep (or max_pages), then replied to by a small
+        concurrent worker queue. Replies go out through the write rate-limit
+        bucket, and each handled conversation is marked read.
+        """
+        batch = {'conversations': 0, 'replied': 0, 'skipped': 0, 'failed': 0, 'pages': 0}
         try:
-            await self._handle_rate_limit()
-            conversations = self.client.conversations()
+            started = time.time()
+            queue = asyncio.Queue()
+            last_sweep = self.state.get_cursor('conversations')
+            newest = None
             
-            for conv in conversations:
-                last_message = conv['last_status']
-                if not last_message:
-                    continue
-                    
-                message_id = last_message['id']
-                
-                # Skip if already replied
-                if message_id in self.replied_dms:
-                    continue
-                
-                # Process the message
-                content = self._clean_html(last_message['content'])
-                sender = last_message['account']['acct']
-                
-                # Determine response style based on content
-                style = self._determine_message_style(content)
-                
-                # Generate styled response
-                response = await self.create_styled_post(
-                    f"Reply to @{sender}: {content}", 
-                    style
-                )
-                
-                # Send reply
-                await self._handle_rate_limit()
-                reply = self.client.status_post(
-                    response,
-                    visibility="direct",
-                    in_reply_to_id=message_id
-                )
-                
-                # Update context
-                self.replied_dms.add(message_id)
-                self._save_dm_context()
-                
-                print(f"Replied to DM from @{sender} with style: {style}")
-                
+            page = await self.api.conversations(limit=40)
+            while page:
+                batch['pages'] += 1
+                reached_cursor = False
+                for conv in page:
+                    if not conv.get('last_status'):
+                        continue
+                    status_id = int(conv['last_status']['id'])
+                    newest = max(newest or status_id, status_id)
+                    if last_sweep is not None and status_id <= last_sweep:
+                        reached_cursor = True
+                        continue
+                    queue.put_nowait(conv)
+                if reached_cursor or batch['pages'] >= self.dm_settings['max_pages']:
+                    break
+                page = await self.api.fetch_next(page)
+            
+            batch['conversations'] = queue.qsize()
+            
+            async def worker():
+                while not queue.empty():
+                    conv = queue.get_nowait()
+                    try:
+                        if await self._process_conversation(conv):
+                            batch['replied'] += 1
+                        else:
+                            batch['skipped'] += 1
+                    except Exception as e:
+                        batch['failed'] += 1
+                        print(f"❌ Error replying to DM: {str(e)}")
+            
+            workers = min(self.dm_settings['workers'], batch['conversations'])
+            await asyncio.gather(*[worker() for _ in range(workers)])
+            
+            # Failed conversations must be paged again on the next sweep
+            if newest is not None and not batch['failed']:
+                self.state.advance_cursor('conversations', newest)
+            
+            batch['elapsed'] = round(time.time() - started, 2)
+            self.last_dm_batch = batch
+            print(f"📨 DM batch: {batch['replied']} replied, {batch['skipped']} skipped, "
+                  f"{batch['failed']} failed across {batch['pages']} page(s) in {batch['elapsed']}s")
         except Exception as e:
             print(f"Error handling DMs: {str(e)}")
+        return batch
+
+    async def _process_conversation(self, conv: Dict) -> bool:
+        """Reply to a conversation if needed and mark it read"""
+        replied = await self.scheduler.run('dm', lambda: self._reply_to_conversation(conv))
+        if conv.get('unread'):
+            await self.api.conversations_read(conv['id'])
+        return replied
+
+    async def _reply_to_conversation(self, conv: Dict) -> bool:
+        """Reply to the latest message in a DM conversation if it is new"""
+        last_message = conv['last_status']
+        if not last_message:
+            return False
+            
+        message_id = last_message['id']
+        cursor_key = f"conversation:{conv['id']}"
+        
+        # Skip if already replied, sent by us, or nothing new since our last reply
+        if message_id in self.seen:
+            return False
+        own_id = (await self._cached_call('account_verify_credentials'))['id']
+        if last_message['account']['id'] == own_id:
+            return False
+        last_seen = self.state.get_cursor(cursor_key)
+        if last_seen is not None and int(message_id) <= last_seen:
+            return False
+        
+        # Process the message
+        content = self._status_text(last_message)['text']
+        sender = last_message['account']['acct']
+        
+        # Determine response style based on content
+        style = self._determine_message_style(content)
+        
+        # Generate styled response
+        post = await self.generate_styled_post(
+            f"Reply to @{sender}: {content}", 
+            style,
+            retry='reply',
+            service='dm'
+        )
+        if post is None:
+            # Left unanswered so the next check tries again
+            return False
+        
+        # Send reply
+        reply = await self.api.status_post(
+            self._render_styled_post(post),
+            visibility="direct",
+            in_reply_to_id=message_id,
+            language=post.language,
+            sensitive=post.sensitive
+        )
+        
+        # Update context
+        self.seen.add(message_id)
+        self.state.advance_cursor(cursor_key, reply['id'])
+        self.state.record_dm_reply(conv['id'], sender, message_id, reply['id'], style)
+        
+        print(f"Replied to DM from @{sender} with style: {style}")
+        return True
 
     def _determine_message_style(self, content: str) -> str:
         """Determine appropriate response style based on message content"""
@@ -943,25 +1340,64 @@ class MastodonPlatform:
             if self.likes_count >= self.like_settings["max_likes_per_hour"]:
                 return
 
-            # Get trending posts
-            trending_posts = await self.get_trending_posts(limit=10)
-            
-            for post in trending_posts:
-                if self.likes_count >= self.like_settings["max_likes_per_hour"]:
-                    break
-                    
-                if random.random() < self.like_settings["like_probability"]:
-                    try:
-                        await self._handle_rate_limit()
-                        self.client.status_favourite(post['id'])
-                        self.likes_count += 1
-                        print(f"Liked post {post['id']} from @{post['author']}")
-                    except Exception as e:
-                        print(f"Error liking post: {str(e)}")
+            batch = await self.scheduler.run('auto_like', lambda: self._like_trending_posts(
+                self.like_settings["max_likes_per_hour"] - self.likes_count
+            ))
+            self.likes_count += batch['liked']
 
         except Exception as e:
             print(f"Error in auto-like process: {str(e)}")
 
+    async def _like_trending_posts(self, max_likes: int) -> Dict:
+        """Favourite up to max_likes current trending posts"""
+        trending_posts = await self.get_trending_posts(limit=10)
+        return await self.like_posts(trending_posts, max_likes)
+
+    async def like_posts(self, posts: List[Dict], max_likes: int) -> Dict:
+        """Favourite a batch of posts through a small concurrent worker queue
+
+        Posts already favourited (per the status or our persisted record) are
+        skipped, the rest are sampled by like_probability, and up to max_likes
+        are sent concurrently within the write rate-limit bucket.
+        """
+        queue = asyncio.Queue()
+        skipped = 0
+        for post in posts:
+            if queue.qsize() >= max_likes:
+                break
+            if post['raw_status'].get('favourited') or post['id'] in self.liked:
+                skipped += 1
+                continue
+            if random.random() < self.like_settings["like_probability"]:
+                queue.put_nowait(post)
+        
+        batch = {'queued': queue.qsize(), 'liked': 0, 'failed': 0, 'skipped': skipped}
+        if not batch['queued']:
+            return batch
+        
+        async def worker():
+            while not queue.empty():
+                post = queue.get_nowait()
+                try:
+                    await self.api.status_favourite(post['id'])
+                    self.liked.add(post['id'])
+                    batch['liked'] += 1
+                    print(f"❤️ Liked post from @{post['author']}")
+                except Exception as e:
+                    batch['failed'] += 1
+                    print(f"❌ Error liking post: {str(e)}")
+        
+        started = time.time()
+        workers = min(self.like_settings['workers'], batch['queued'])
+        await asyncio.gather(*[worker() for _ in range(workers)])
+        batch['elapsed'] = round(time.time() - started, 2)
+        batch['likes_per_second'] = round(batch['liked'] / batch['elapsed'], 2) if batch['elapsed'] else batch['liked']
+        
+        self.last_like_batch = batch
+        print(f"❤️ Like batch: {batch['liked']}/{batch['queued']} liked in {batch['elapsed']}s "
+              f"({batch['likes_per_second']}/s), {batch['skipped']} already liked")
+        return batch
+
     async def start_services(self):
         """Start all automated services"""
         print("\n🚀 Starting all automated services...")
@@ -969,6 +1405,9 @@ class MastodonPlatform:
         try:
             # Create tasks for each service
             tasks = []
+            streaming = self.ingestion_settings['mode'] == 'streaming'
+            if streaming:
+                self.log_info("Using streaming ingestion for hashtags, mentions and DMs")
             
             # Auto-posting service
             if self.auto_post_settings['enabled']:
@@ -979,7 +1418,9 @@ class MastodonPlatform:
             
             # DM service
             if self.dm_settings['enabled']:
-                tasks.append(asyncio.create_task(self.handle_dm_service()))
+                tasks.append(asyncio.create_task(
+                    self.stream_direct_messages() if streaming else self.handle_dm_service()
+                ))
                 self.services_status['dm'] = True
                 print("📨 DM service enabled")
                 self.log_info("DM service enabled")
@@ -993,12 +1434,16 @@ class MastodonPlatform:
             
             # Hashtag monitoring
             if self.hashtags:
-                tasks.append(asyncio.create_task(self.monitor_hashtags()))
+                tasks.append(asyncio.create_task(
+                    self.stream_hashtags() if streaming else self.monitor_hashtags()
+                ))
                 self.services_status['hashtag'] = True
                 print("🔍 Hashtag monitoring enabled")
                 self.log_info("Hashtag monitoring enabled")
-            if self.get_mentions:
-                tasks.append(asyncio.create_task(self.get_mentions()))
+            if self.mention_settings['enabled']:
+                tasks.append(asyncio.create_task(
+                    self.stream_mentions() if streaming else self.monitor_mentions()
+                ))
                 self.services_status['mention'] = True
                 print("📣 Mention handling enabled")
                 self.log_info("Mention handling enabled")
@@ -1095,21 +1540,10 @@ class MastodonPlatform:
                 # Get trending posts to like
                 if current_time - last_like_time >= 300:  # Check every 5 minutes
                     print("\n🔍 Finding posts to like...")
-                    trending_posts = await self.get_trending_posts(limit=10)
-                    
-                    for post in trending_posts:
-                        if hourly_likes >= self.like_settings["max_likes_per_hour"]:
-                            break
-                            
-                        if random.random() < self.like_settings["like_probability"]:
-                            try:
-                                await self._handle_rate_limit()
-                                self.client.status_favourite(post['id'])
-                                hourly_likes += 1
-                                print(f"❤️ Liked post from @{post['author']}")
-                            except Exception as e:
-                                print(f"❌ Error liking post: {str(e)}")
-                                continue
+                    batch = await self.scheduler.run('auto_like', lambda: self._like_trending_posts(
+                        self.like_settings["max_likes_per_hour"] - hourly_likes
+                    ))
+                    hourly_likes += batch['liked']
                     
                     last_like_time = current_time
                 
@@ -1122,52 +1556,28 @@ class MastodonPlatform:
                 print(f"❌ Error in auto-like service: {str(e)}")
                 await asyncio.sleep(300)  # Wait 5 minutes on error
 
-    async def monitor_hashtags(self):
-        """Monitor hashtags and respond to posts"""
+    async def monitor_hashtags(self, hashtags: Optional[List[str]] = None):
+        """Monitor hashtags and respond to posts
+
+        Polls the given hashtags, or all configured hashtags when none are given.
+        """
         print("\n🔍 Starting hashtag monitoring service...")
-        processed_posts = set()  # Keep track of processed posts
         
         while True:
             try:
-                if not self.hashtags:
+                watched = hashtags or self.hashtags
+                if not watched:
                     await asyncio.sleep(60)
                     continue
                 
-                print("\n#️⃣ Checking hashtags:", ", ".join(self.hashtags))
-                for hashtag in self.hashtags:
+                print("\n#️⃣ Checking hashtags:", ", ".join(watched))
+                for hashtag in watched:
                     try:
-                        # Get posts for hashtag
-                        posts = await self.search_hashtag(hashtag)
-                        
-                        for post in posts:
-                            try:
-                                # Skip if already processed
-                                if post['id'] in processed_posts:
-                                    continue
-                                
-                                print(f"\n📝 Processing #{hashtag} post from @{post['author']}")
-                                
-                                # Process the post
-                                result = await self.process_single_post(post)
-                                if result and 'error' not in result:
-                                    processed_posts.add(post['id'])
-                                    print(f"✅ Successfully responded to post from @{post['author']}")
-                                
-                                # Respect cooldown period
-                                await asyncio.sleep(self.cooldown_period)
-                                
-                            except Exception as e:
-                                print(f"❌ Error processing post: {str(e)}")
-                                continue
-                        
+                        await self._poll_hashtag(hashtag)
                     except Exception as e:
                         print(f"❌ Error checking hashtag #{hashtag}: {str(e)}")
                         continue
                 
-                # Cleanup old processed posts (keep last 1000)
-                if len(processed_posts) > 1000:
-                    processed_posts = set(list(processed_posts)[-1000:])
-                
                 # Wait before next check
                 await asyncio.sleep(self.check_interval)
                 
@@ -1178,6 +1588,191 @@ class MastodonPlatform:
                 print(f"❌ Error in hashtag monitoring: {str(e)}")
                 await asyncio.sleep(300)  # Wait 5 minutes on error
 
+    async def _poll_hashtag(self, hashtag: str) -> bool:
+        """Reply to new posts for one hashtag, oldest first
+
+        The hashtag cursor only moves past a post once it has been replied to
+        (or given up on after max_attempts failures), so a failed post is
+        fetched again on the next poll. Posts deferred by the token budget
+        don't count as attempts. Returns True when nothing is left behind.
+        """
+        cursor_key = f"hashtag:{hashtag.strip('#').lower()}"
+        posts = await self.search_hashtag(hashtag, incremental=True)
+        caught_up = True
+        for post in posts:
+            if post['id'] not in self.seen:
+                print(f"\n📝 Processing #{hashtag} post from @{post['author']}")
+                try:
+                    result = await self.process_single_post(post)
+                except TokenBudgetExceeded as e:
+                    # Leave this post and the rest behind the cursor for the next window
+                    print(f"⏸️ Deferring #{hashtag} replies: {str(e)}")
+                    if caught_up:
+                        self._hold_cursor(cursor_key, post['id'])
+                    caught_up = False
+                    break
+                except Exception as e:
+                    print(f"❌ Error processing post: {str(e)}")
+                    result = {"error": str(e)}
+                if result and 'error' not in result:
+                    self.seen.add(post['id'])
+                    print(f"✅ Successfully responded to post from @{post['author']}")
+                if not self._is_handled(cursor_key, post['id'], result):
+                    if caught_up:
+                        self._hold_cursor(cursor_key, post['id'])
+                    caught_up = False
+                
+                # Respect cooldown period
+                await asyncio.sleep(self.cooldown_period)
+            if caught_up:
+                self.state.advance_cursor(cursor_key, post.get('cursor_id', post['id']))
+        if caught_up:
+            self.cursor_holds.discard(cursor_key)
+        return caught_up
+
+    def _is_handled(self, cursor_key: str, item_id, result: Optional[Dict]) -> bool:
+        """Whether the cursor may move past an item, counting failed attempts"""
+        key = (cursor_key, int(item_id))
+        if result and 'error' not in result:
+            self.failed_attempts.pop(key, None)
+            return True
+        attempts = self.failed_attempts.get(key, 0) + 1
+        if attempts >= self.ingestion_settings['max_attempts']:
+            self.failed_attempts.pop(key, None)
+            print(f"⚠️ Giving up on {cursor_key} item {item_id} after {attempts} attempts")
+            return True
+        self.failed_attempts[key] = attempts
+        return False
+
+    def _hold_cursor(self, cursor_key: str, item_id):
+        """Stop streamed events moving a cursor until a poll retries the failed item"""
+        if self.state.get_cursor(cursor_key) is None:
+            # Start the catch-up poll at the failed item rather than the newest one
+            self.state.advance_cursor(cursor_key, int(item_id) - 1)
+        self.cursor_holds.add(cursor_key)
+
+    async def monitor_mentions(self):
+        """Poll for new mentions and respond to them"""
+        print("\n📣 Starting mention monitoring service...")
+        
+        while True:
+            try:
+                if self.mention_settings['enabled']:
+                    await self.get_mentions()
+                await asyncio.sleep(self.check_interval)
+                
+            except asyncio.CancelledError:
+                print("🛑 Mention monitoring service stopped")
+                break
+            except Exception as e:
+                print(f"❌ Error in mention monitoring: {str(e)}")
+                await asyncio.sleep(300)  # Wait 5 minutes on error
+
+    async def _streaming_url(self) -> str:
+        """Resolve the instance's streaming API base URL"""
+        try:
+            instance = await self._cached_call('instance')
+            url = instance['urls']['streaming_api']
+        except Exception:
+            url = None
+        url = url or self.client.api_base_url
+        return url.replace('wss://', 'https://', 1).replace('ws://', 'http://', 1)
+
+    async def _run_stream(self, name: str, stream: str, params: Optional[Dict], on_event, fallback):
+        """Consume a streaming endpoint, falling back to polling if it is unavailable"""
+        try:
+            listener = MastodonStreamListener(
+                await self._streaming_url(),
+                self.access_token,
+                on_event,
+                max_failures=self.ingestion_settings['max_failures'],
+                backoff_max=self.ingestion_settings['backoff_max']
+            )
+            self.stream_listeners[name] = listener
+            print(f"📡 Listening to {name} stream...")
+            await listener.run(stream, params)
+        except asyncio.CancelledError:
+            print(f"🛑 {name} stream stopped")
+            raise
+        except StreamUnavailable as e:
+            self.log_error(f"{name} stream unavailable ({str(e)}), falling back to polling")
+            self.stream_listeners.pop(name, None)
+            await fallback()
+
+    async def stream_hashtags(self):
+        """Respond to hashtag posts as they are published"""
+        await asyncio.gather(*[
+            self._run_stream(
+                f"hashtag:{tag}",
+                'hashtag',
+                {'tag': tag},
+                lambda event, payload, tag=tag: self._on_hashtag_event(tag, event, payload),
+                lambda tag=tag: self.monitor_hashtags([tag])
+            )
+            for tag in (tag.strip('#') for tag in self.hashtags)
+        ])
+
+    async def stream_mentions(self):
+        """Respond to mentions as they arrive on the user stream"""
+        await self._run_stream('user', 'user', None, self._on_user_event, self.monitor_mentions)
+
+    async def stream_direct_messages(self):
+        """Respond to DMs as they arrive on the direct stream"""
+        await self._run_stream('direct', 'direct', None, self._on_direct_event, self.handle_dm_service)
+
+    async def _on_hashtag_event(self, hashtag: str, event_type: str, status):
+        if event_type != 'update':
+            return
+        cursor_key = f"hashtag:{hashtag.lower()}"
+        if cursor_key in self.cursor_holds:
+            # An earlier post failed: catch up from the cursor, this post included
+            await self._poll_hashtag(hashtag)
+            return
+        
+        # Keep the polling cursor current so a fallback resumes from here
+        own_id = (await self._cached_call('account_verify_credentials'))['id']
+        if status['id'] in self.seen or status['account']['id'] == own_id:
+            self.state.advance_cursor(cursor_key, status['id'])
+            return
+        
+        post = self._to_post_info(status)
+        print(f"\n📝 Processing #{hashtag} post from @{post['author']}")
+        try:
+            result = await self.process_single_post(post)
+        except TokenBudgetExceeded as e:
+            print(f"⏸️ Deferring #{hashtag} replies: {str(e)}")
+            self._hold_cursor(cursor_key, status['id'])
+            return
+        if result and 'error' not in result:
+            self.seen.add(status['id'])
+            print(f"✅ Successfully responded to post from @{post['author']}")
+        if self._is_handled(cursor_key, status['id'], result):
+            self.state.advance_cursor(cursor_key, status['id'])
+        else:
+            self._hold_cursor(cursor_key, status['id'])
+        await asyncio.sleep(self.cooldown_period)
+
+    async def _on_user_event(self, event_type: str, notification):
+        if (event_type != 'notification' or notification.get('type') != 'mention' or
+                not self.mention_settings['enabled']):
+            return
+        cursor_key = 'notifications:mention'
+        if cursor_key in self.cursor_holds:
+            # An earlier mention failed: catch up from the cursor, this one included
+            await self.get_mentions()
+            return
+        response = await self.handle_mention(notification['status'])
+        if self._is_handled(cursor_key, notification['id'], response):
+            self.state.advance_cursor(cursor_key, notification['id'])
+        else:
+            self._hold_cursor(cursor_key, notification['id'])
+
+    async def _on_direct_event(self, event_type: str, conversation):
+        if (event_type != 'conversation' or not self.dm_settings['enabled'] or
+                not self.dm_settings['auto_reply']):
+            return
+        await self._process_conversation(conversation)
+
     def update_settings(self, settings_type, new_settings):
         """Update service settings"""
         try:
@@ -1187,6 +1782,9 @@ class MastodonPlatform:
             elif settings_type == 'dm':
                 self.dm_settings.update(new_settings)
                 print(f"✅ Updated DM settings: {new_settings}")
+            elif settings_type == 'mention':
+                self.mention_settings.update(new_settings)
+                print(f"✅ Updated mention settings: {new_settings}")
             elif settings_type == 'like':
                 self.like_settings.update(new_settings)
                 print(f"✅ Updated auto-like settings: {new_settings}")
@@ -1195,7 +1793,57 @@ class MastodonPlatform:
                 print(f"✅ Updated hashtags: {new_settings}")
             elif settings_type == 'post_style':
                 self.post_config.update(new_settings)
+                self.style_models.configure(max_length=self.post_config['max_length'])
+                # Drafts were rendered under the old config
+                self.draft_pool.clear()
                 print(f"✅ Updated post style: {new_settings}")
+            elif settings_type == 'trending':
+                self.trending_settings.update(new_settings)
+                print(f"✅ Updated trending settings: {new_settings}")
+            elif settings_type == 'ingestion':
+                self.ingestion_settings.update(new_settings)
+                print(f"✅ Updated ingestion settings: {new_settings}")
+            elif settings_type == 'llm':
+                self.llm_settings.update(new_settings)
+                self.llm.pool.configure(**self.llm_settings)
+                print(f"✅ Updated LLM settings: {new_settings}")
+            elif settings_type == 'drafts':
+                self.draft_settings.update(new_settings)
+                self.draft_pool.configure(
+                    size=self.draft_settings['size'],
+                    max_age=self.draft_settings['max_age']
+                )
+                print(f"✅ Updated draft settings: {new_settings}")
+            elif settings_type == 'chat':
+                self.chat_settings.update(new_settings)
+                self.chat.configure(**self.chat_settings)
+                print(f"✅ Updated chat settings: {new_settings}")
+            elif settings_type == 'scheduler':
+                # e.g. {'workers': 6} or {'priorities': {'hashtag': 0}}
+                self.scheduler_settings['priorities'].update(new_settings.get('priorities', {}))
+                self.scheduler_settings.update({key: value for key, value in new_settings.items() if key != 'priorities'})
+                self.scheduler.configure(
+                    workers=self.scheduler_settings['workers'],
+                    aging=self.scheduler_settings['aging']
+                )
+                print(f"✅ Updated scheduler settings: {new_settings}")
+            elif settings_type == 'tokens':
+                # e.g. {'hashtag': {'hourly': 10000}}; the meter shares this dict
+                for service, budget in new_settings.items():
+                    self.token_budgets.setdefault(service, {}).update(budget)
+                print(f"✅ Updated token budgets: {new_settings}")
+            elif settings_type == 'retry':
+                # e.g. {'reply': {'max_attempts': 1}}; names must be existing budgets
+                unknown = set(new_settings) - set(self.retry_settings)
+                if unknown:
+                    raise ValueError(f"Unknown retry budgets: {', '.join(sorted(unknown))}")
+                # Build every policy first so bad keys or values change nothing
+                policies = {name: RetryPolicy(**dict(self.retry_settings[name], **budget))
+                            for name, budget in new_settings.items()}
+                for name, budget in new_settings.items():
+                    self.retry_settings[name].update(budget)
+                self.retry_policies.update(policies)
+                print(f"✅ Updated retry settings: {new_settings}")
             return True
         except Exception as e:
             print(f"❌ Error updating {settings_type} settings: {str(e)}")
@@ -1205,73 +1853,62 @@ class MastodonPlatform:
         """Get current status of all services"""
         return {
             'services': self.services_status,
+            'io': self.api.get_stats(),
+            'cache': self.api_cache.get_stats(),
+            'rate_limits': self.api.rate_limiter.get_state(),
+            'media': self.media.get_stats(),
+            'last_like_batch': self.last_like_batch,
+            'last_dm_batch': self.last_dm_batch,
+            'last_candidate_batch': self.last_candidate_batch,
+            'seen_index': self.seen.get_stats(),
+            'state_store': self.state.get_stats(),
+            'status_text_cache': self.status_text.get_stats(),
+            'post_index': self.post_index.get_stats(),
+            'llm': self.llm.get_stats(),
+            'llm_backend': self.llm_backend.get_stats(),
+            'llm_cache': self.llm_cache.get_stats(),
+            'style_models': self.style_models.get_stats(),
+            'chat': self.chat.get_stats(),
+            'scheduler': self.scheduler.get_stats(),
+            'drafts': self.draft_pool.get_stats(),
+            'tokens': self.token_meter.get_stats(),
+            'llm_retries': {name: policy.get_stats() for name, policy in self.retry_policies.items()},
+            'streams': {name: listener.get_stats() for name, listener in self.stream_listeners.items()},
             'settings': {
                 'auto_post': self.auto_post_settings,
                 'dm': self.dm_settings,
+                'mention': self.mention_settings,
                 'like': self.like_settings,
                 'hashtags': self.hashtags,
-                'post_style': self.post_config
+                'post_style': self.post_config,
+                'ingestion': self.ingestion_settings,
+                'llm': self.llm_settings,
+                'retry': self.retry_settings,
+                'tokens': self.token_budgets,
+                'chat': self.chat_settings,
+                'scheduler': self.scheduler_settings,
+                'drafts': self.draft_settings
             }
         }
 
     def _load_trends_tracking(self):
         """Load platform trends tracking data"""
-        try:
-            if os.path.exists(self.trends_tracking_file):
-                with open(self.trends_tracking_file, 'r') as f:
-                    data = json.load(f)
-                    self.platform_trends_used_today = data.get('used_today', False)
-                    self.last_platform_trends_reset = data.get('last_reset', time.time())
-        except Exception as e:
-            print(f"Error loading trends tracking: {str(e)}")
+        data = self.state.get_value('platform_trends', {})
+        self.platform_trends_used_today = data.get('used_today', False)
+        self.last_platform_trends_reset = data.get('last_reset', time.time())
 
     def _save_trends_tracking(self):
         """Save platform trends tracking data"""
-        try:
-            with open(self.trends_tracking_file, 'w') as f:
-                json.dump({
-                    'used_today': self.platform_trends_used_today,
-                    'last_reset': self.last_platform_trends_reset
-                }, f)
-        except Exception as e:
-            print(f"Error saving trends tracking: {str(e)}")
-
-    def _load_last_posts(self):
-        """Load last posts cache"""
-        try:
-            if os.path.exists(self.last_posts_file):
-                with open(self.last_posts_file, 'r') as f:
-                    self.last_posts_cache = json.load(f)
-                    # Keep only last 5 posts
-                    self.last_posts_cache = self.last_posts_cache[-5:]
-        except Exception as e:
-            print(f"Error loading last posts cache: {str(e)}")
-            self.last_posts_cache = []
-
-    def _save_last_posts(self):
-        """Save last posts cache"""
-        try:
-            with open(self.last_posts_file, 'w') as f:
-                json.dump(self.last_posts_cache, f)
-        except Exception as e:
-            print(f"Error saving last posts cache: {str(e)}")
+        self.state.set_value('platform_trends', {
+            'used_today': self.platform_trends_used_today,
+            'last_reset': self.last_platform_trends_reset
+        })
 
     def _is_post_recent(self, content):
-        """Check if similar content was posted recently"""
-        return any(self._calculate_similarity(content, past_post) > 0.7 for past_post in self.last_posts_cache)
+        """Check if similar content was posted before"""
+        return self.post_index.is_duplicate(content)
 
-    def _calculate_similarity(self, text1, text2):
-        """Calculate similarity between two texts using word overlap"""
-        try:
-            # Convert to sets of words for comparison
-            words1 = set(text1.lower().split())
-            words2 = set(text2.lower().split())
-            
-            # Calculate Jaccard similarity
-            intersection = len(words1.intersection(words2))
-            union = len(words1.union(words2))
-            
-            return intersection / union if union > 0 else 0
-        except Exception as e:
-            print(f"Error calculating similarity: {str(e)}")
-            return 0
\ No newline at end of file
+    def _remember_post(self, content):
+        """Record a published post for duplicate checks"""
+        self.state.add_recent_post(content)
+        self.post_index.add(content)
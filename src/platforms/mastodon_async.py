@@ -0,0 +1,131 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from src.utils.rate_limiter import RateLimiter
+
+# Rate-limit bucket for each mutating endpoint; anything else counts as a read
+WRITE_METHODS = {
+    'status_post', 'status_reply', 'status_delete', 'status_favourite',
+    'status_unfavourite', 'status_reblog', 'status_unreblog',
+    'status_bookmark', 'status_unbookmark', 'conversations_read',
+    'account_follow', 'account_unfollow', 'notifications_dismiss',
+    'notifications_clear'
+}
+MEDIA_METHODS = {'media_post', 'media_update'}
+
+def bucket_for(method_name: str) -> str:
+    """Map a Mastodon.py method to its rate-limit bucket"""
+    if method_name in MEDIA_METHODS:
+        return 'media'
+    if method_name in WRITE_METHODS:
+        return 'write'
+    return 'read'
+
+def parse_ratelimit_headers(headers) -> tuple:
+    """(limit, remaining, reset time) from a response's X-RateLimit headers"""
+    if not headers or 'X-RateLimit-Remaining' not in headers:
+        return None, None, None
+    try:
+        reset = headers['X-RateLimit-Reset']
+        try:
+            # GoToSocial sends epoch seconds, Mastodon an ISO 8601 time
+            reset_at = float(int(reset))
+        except ValueError:
+            reset_at = datetime.fromisoformat(reset.replace('Z', '+00:00')).timestamp()
+        if 'Date' in headers:
+            # Adjust server time to the local clock
+            reset_at += time.time() - parsedate_to_datetime(headers['Date']).timestamp()
+        return int(headers['X-RateLimit-Limit']), int(headers['X-RateLimit-Remaining']), reset_at
+    except (KeyError, ValueError, TypeError):
+        return None, None, None
+
+class AsyncMastodonClient:
+    """Awaitable facade over a synchronous Mastodon.py client.
+
+    Every API method is dispatched to a bounded thread pool so a slow
+    instance response never blocks the event loop. Attribute access mirrors
+    the wrapped client: ``await api.timeline_hashtag('python')``. Calls take
+    a token from the matching rate-limit bucket first, and the call's own
+    X-RateLimit headers are fed back afterwards.
+    """
+
+    def __init__(self, client, max_workers: int = 8, rate_limiter: Optional[RateLimiter] = None):
+        self.client = client
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="mastodon-io"
+        )
+        self.in_flight = 0
+        self.total_calls = 0
+        # Mastodon.py keeps rate-limit state in attributes shared by all
+        # workers, so each worker records its own last response instead
+        self._responses = threading.local()
+        self._capture_responses()
+
+    def _capture_responses(self):
+        session = getattr(self.client, 'session', None)
+        if session is None:
+            return
+        request = session.request
+
+        @functools.wraps(request)
+        def capture(*args, **kwargs):
+            response = request(*args, **kwargs)
+            self._responses.last = response
+            return response
+
+        session.request = capture
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self.call(attr, *args, bucket=bucket_for(name), **kwargs)
+
+        return call
+
+    async def call(self, func, *args, bucket: str = 'read', **kwargs):
+        """Run a blocking client call in the I/O pool under the rate limiter"""
+        await self.rate_limiter.acquire(bucket)
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        self.total_calls += 1
+        try:
+            result, headers = await loop.run_in_executor(
+                self.executor,
+                functools.partial(self._call_with_headers, func, *args, **kwargs)
+            )
+        finally:
+            self.in_flight -= 1
+        self.rate_limiter.update_from_headers(bucket, *headers)
+        return result
+
+    def _call_with_headers(self, func, *args, **kwargs):
+        # Runs on a worker thread: the last response this thread saw is the
+        # call's own (the last page, if the call made several requests)
+        self._responses.last = None
+        result = func(*args, **kwargs)
+        response = self._responses.last
+        return result, parse_ratelimit_headers(response.headers if response is not None else None)
+
+    def get_stats(self):
+        """Get I/O pool usage"""
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "total_calls": self.total_calls
+        }
+
+    def shutdown(self):
+        """Release pool threads"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+class AsyncTTLCache:
+    """Read-through TTL cache with single-flight request coalescing.
+
+    Concurrent callers asking for the same key while a fetch is in flight
+    share that fetch instead of issuing their own. Failed fetches are not
+    cached; the error is raised to every waiter.
+    """
+
+    def __init__(self, default_ttl: float = 60, max_entries: int = 1024):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}  # key -> asyncio.Future
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                           ttl: Optional[float] = None) -> Any:
+        """Return the cached value for key, fetching it on a miss"""
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_fetched(key, t, ttl))
+        # Shielded so one cancelled caller does not abort the shared fetch
+        return await asyncio.shield(task)
+
+    def _on_fetched(self, key: Hashable, task: asyncio.Future, ttl: Optional[float]):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.set(key, task.result(), ttl)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value with the given (or default) TTL"""
+        ttl = self.default_ttl if ttl is None else ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or everything when no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def get_stats(self):
+        """Get cache hit/miss counters"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
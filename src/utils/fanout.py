@@ -0,0 +1,47 @@
+import asyncio
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+async def first_accepted(make_calls: Iterable[Callable], accept: Callable, width: int = 3,
+                         stats: Optional[Dict] = None) -> Optional[Tuple[int, object]]:
+    """Run calls ``width`` at a time and return (index, result) of the first accepted result
+
+    Calls are started in order as slots free up; once a result passes
+    ``accept`` the calls still running are cancelled. Returns None when
+    every result is rejected. An exception from a call cancels the rest
+    and is re-raised. ``stats`` (if given) receives started/rejected/
+    cancelled counts.
+    """
+    counts = {'started': 0, 'rejected': 0, 'cancelled': 0}
+    calls = iter(enumerate(make_calls))
+    running = {}
+
+    def start_next():
+        for index, make_call in calls:
+            running[asyncio.ensure_future(make_call())] = index
+            counts['started'] += 1
+            return
+
+    try:
+        for _ in range(max(width, 1)):
+            start_next()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            # Several calls can finish together; prefer the earliest-started one
+            for task in sorted(done, key=running.get):
+                index = running.pop(task)
+                result = task.result()
+                if accept(result):
+                    return index, result
+                counts['rejected'] += 1
+                start_next()
+        return None
+    finally:
+        pending = [task for task in running if not task.done()]
+        for task in pending:
+            task.cancel()
+        counts['cancelled'] += len(pending)
+        if running:
+            # Also collects the outcome of calls that finished unused
+            await asyncio.gather(*running, return_exceptions=True)
+        if stats is not None:
+            stats.update(counts)
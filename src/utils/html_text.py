@@ -0,0 +1,84 @@
+import html
+import re
+from collections import OrderedDict
+from typing import Dict
+
+# Everything in status HTML that should vanish, in one regex pass: link
+# previews (the URL split across invisible spans) as whole elements, and any
+# other tag. Mention and hashtag links lose their tags but keep "@user"/"#tag".
+MARKUP_PATTERN = re.compile(r'<(?:a\s[^>]*><span class="invisible">.*?</a>|[^>]*>)', re.DOTALL)
+# Bare URLs only appear outside links, e.g. in model output
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+# Mastodon renders both as <a class="... mention ...">@<span>user</span></a>
+# (hashtags are "#<span>tag</span>")
+MENTION_PATTERN = re.compile(r'class="[^"]*\bmention\b[^"]*"[^>]*>([@#])<span>([^<]*)</span>')
+
+# The entities Mastodon's sanitizer emits are decoded with plain replaces
+# ('&amp;' last); anything else goes through html.unescape
+COMMON_ENTITIES = (('&lt;', '<'), ('&gt;', '>'), ('&quot;', '"'), ('&#39;', "'"), ('&amp;', '&'))
+OTHER_ENTITY_PATTERN = re.compile(r'&(?!(?:lt|gt|quot|#39|amp);)#?\w+;')
+
+def unescape(text: str) -> str:
+    """Decode HTML entities"""
+    if '&' not in text:
+        return text
+    if OTHER_ENTITY_PATTERN.search(text):
+        return html.unescape(text)
+    for entity, char in COMMON_ENTITIES:
+        if entity in text:
+            text = text.replace(entity, char)
+    return text
+
+def html_to_text(content: str) -> str:
+    """Convert status HTML to a single line of text
+
+    Only pass raw HTML: entities are decoded, so running the result (or any
+    other plain text containing '<' or '&') through again corrupts it.
+    """
+    if '<' in content:
+        # Paragraph and line breaks separate words
+        content = content.replace('</p>', ' ').replace('<br />', ' ')
+        content = MARKUP_PATTERN.sub('', content)
+    if '://' in content or 'www.' in content:
+        content = URL_PATTERN.sub('', content)
+    return ' '.join(unescape(content).split())
+
+def parse_status_html(content: str) -> Dict:
+    """Convert status HTML to text, keeping mentions and hashtags as fields"""
+    mentions, hashtags = [], []
+    if 'mention' in content:
+        for sigil, name in MENTION_PATTERN.findall(content):
+            (hashtags if sigil == '#' else mentions).append(unescape(name))
+    return {
+        "text": html_to_text(content),
+        "mentions": mentions,
+        "hashtags": hashtags
+    }
+
+class StatusTextCache:
+    """LRU cache of parsed status text keyed by status ID (and edit time)"""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, status: Dict) -> Dict:
+        """Get the parsed text of a status, parsing it on first use"""
+        key = (status['id'], status.get('edited_at'))
+        parsed = self._entries.get(key)
+        if parsed is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return parsed
+        self.misses += 1
+        parsed = parse_status_html(status['content'])
+        self._entries[key] = parsed
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return parsed
+
+    def get_stats(self):
+        """Get cache counters"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
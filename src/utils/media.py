@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from io import BytesIO
+from typing import List, Optional
+
+import aiohttp
+from PIL import Image
+
+class MediaTooLarge(Exception):
+    """Raised when a download or decoded image exceeds the configured caps"""
+
+class MediaFetcher:
+    """Concurrent image downloader with a shared connection pool.
+
+    Downloads are streamed up to ``max_bytes``, images larger than
+    ``max_pixels`` are rejected before decoding (decompression bombs), and
+    decoded images are cached by URL and by content hash so repeated or
+    reposted media is neither downloaded nor decoded twice.
+    """
+
+    def __init__(self, max_connections: int = 8, timeout: float = 15,
+                 max_bytes: int = 10 * 1024 * 1024, max_pixels: int = 40_000_000,
+                 cache_size: int = 128):
+        self.max_connections = max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=5)
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.cache_size = cache_size
+        self._session = None
+        self._session_loop = None
+        self._url_cache = OrderedDict()  # url -> content hash
+        self._image_cache = OrderedDict()  # content hash -> Image
+        self._inflight = {}  # url -> Task
+        self.stats = {'downloads': 0, 'url_hits': 0, 'hash_hits': 0, 'errors': 0, 'bytes': 0}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Sessions are bound to the loop they were created on
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=self.max_connections)
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def fetch_image(self, url: str) -> Optional[Image.Image]:
+        """Download and decode an image, returning None on failure"""
+        content_hash = self._url_cache.get(url)
+        if content_hash in self._image_cache:
+            self._url_cache.move_to_end(url)
+            self._image_cache.move_to_end(content_hash)
+            self.stats['url_hits'] += 1
+            return self._image_cache[content_hash]
+
+        # Concurrent requests for the same URL share one download
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._download(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            print(f"Error downloading image: {str(e)}")
+            return None
+
+    async def fetch_images(self, urls: List[str]) -> List[Optional[Image.Image]]:
+        """Download several images concurrently, preserving order"""
+        return await asyncio.gather(*[self.fetch_image(url) for url in urls])
+
+    async def _download(self, url: str) -> Image.Image:
+        try:
+            data = await self._read_capped(url)
+            content_hash = hashlib.sha256(data).hexdigest()
+            image = self._image_cache.get(content_hash)
+            if image is not None:
+                self.stats['hash_hits'] += 1
+            else:
+                image = await asyncio.to_thread(self._decode, data)
+                self._remember(self._image_cache, content_hash, image)
+            self._remember(self._url_cache, url, content_hash)
+            return image
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+
+    async def _read_capped(self, url: str) -> bytes:
+        session = self._get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            if response.content_length and response.content_length > self.max_bytes:
+                raise MediaTooLarge(f"{url} is {response.content_length} bytes")
+            buffer = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                buffer.extend(chunk)
+                if len(buffer) > self.max_bytes:
+                    raise MediaTooLarge(f"{url} exceeds {self.max_bytes} bytes")
+        self.stats['downloads'] += 1
+        self.stats['bytes'] += len(buffer)
+        return bytes(buffer)
+
+    def _decode(self, data: bytes) -> Image.Image:
+        image = Image.open(BytesIO(data))
+        # Header-only check before any pixel data is decompressed
+        width, height = image.size
+        if width * height > self.max_pixels:
+            raise MediaTooLarge(f"image is {width}x{height} pixels")
+        image.load()
+        return image
+
+    def _remember(self, cache: OrderedDict, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def get_stats(self):
+        """Get download and cache counters"""
+        return dict(self.stats, cached_images=len(self._image_cache))
+
+    async def close(self):
+        """Close the shared connection pool"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+_shared_fetcher = None
+
+def get_media_fetcher() -> MediaFetcher:
+    """Get the process-wide media fetcher shared by all platforms"""
+    global _shared_fetcher
+    if _shared_fetcher is None:
+        _shared_fetcher = MediaFetcher()
+    return _shared_fetcher
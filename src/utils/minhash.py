@@ -0,0 +1,103 @@
+import hashlib
+from array import array
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+MAX_HASH = (1 << 32) - 1
+
+def _word_hashes(text: str, num_perm: int, seed: bytes) -> List[array]:
+    # One SHAKE digest per word supplies num_perm independent 32-bit hashes
+    # (stable across processes, unlike the salted str hash()). The word set
+    # is the same one the old whitespace Jaccard check compared.
+    hashes = []
+    for word in set(text.lower().split()):
+        values = array('I')
+        values.frombytes(hashlib.shake_128(seed + word.encode()).digest(num_perm * 4))
+        hashes.append(values)
+    return hashes
+
+class MinHashIndex:
+    """Near-duplicate lookup over every post the bot has published.
+
+    Each post is reduced to a MinHash signature of its word set; signatures
+    are split into ``bands`` LSH buckets so a query only compares against
+    posts sharing at least one band, then confirms the Jaccard estimate
+    against ``threshold``. Signatures are persisted in the state store.
+    """
+
+    def __init__(self, state, num_perm: int = 64, bands: int = 16,
+                 threshold: float = 0.7, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.state = state
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.seed = seed.to_bytes(4, 'little')
+        self.signatures = []
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+        for blob in state.post_signatures():
+            signature = array('I')
+            signature.frombytes(blob)
+            if len(signature) == num_perm:
+                self._insert(tuple(signature))
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def signature(self, text: str) -> tuple:
+        """MinHash signature of a text's word set"""
+        hashes = _word_hashes(text, self.num_perm, self.seed)
+        if not hashes:
+            return (MAX_HASH,) * self.num_perm
+        # Column-wise minimum: one min per hash function, computed in C
+        return tuple(map(min, *hashes)) if len(hashes) > 1 else tuple(hashes[0])
+
+    def _band_keys(self, signature: tuple):
+        rows = self.rows
+        return [hash(signature[i * rows:(i + 1) * rows]) for i in range(self.bands)]
+
+    def _insert(self, signature: tuple):
+        position = len(self.signatures)
+        self.signatures.append(signature)
+        for band, key in enumerate(self._band_keys(signature)):
+            self.buckets[band][key].append(position)
+
+    def add(self, text: str):
+        """Index a published post and persist its signature"""
+        signature = self.signature(text)
+        self._insert(signature)
+        self.state.add_post_signature(array('I', signature).tobytes())
+
+    def update(self, texts: Iterable[str]):
+        """Index several posts"""
+        for text in texts:
+            self.add(text)
+
+    def most_similar(self, text: str) -> Optional[float]:
+        """Highest estimated Jaccard similarity to an indexed post, if any shares a band"""
+        signature = self.signature(text)
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+        if not candidates:
+            return None
+        return max(
+            sum(x == y for x, y in zip(signature, self.signatures[position])) / self.num_perm
+            for position in candidates
+        )
+
+    def is_duplicate(self, text: str) -> bool:
+        """Check whether a text is a near-duplicate of any indexed post"""
+        similarity = self.most_similar(text)
+        return similarity is not None and similarity >= self.threshold
+
+    def get_stats(self):
+        """Get index size"""
+        return {
+            "posts": len(self.signatures),
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "threshold": self.threshold
+        }
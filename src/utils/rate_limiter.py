@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+class TokenBucket:
+    """Token bucket that defers to the server's rate-limit window when known.
+
+    Without server data the bucket refills continuously at
+    ``capacity / period`` tokens per second, so requests may burst up to
+    ``capacity``. Once X-RateLimit headers are seen, the reported remaining
+    quota caps the tokens until the reported reset time, then the bucket
+    refills to the server's limit.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.updated_at = time.time()
+        self.reset_at = None
+        self.acquired = 0
+        self.waits = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.time()
+        if self.reset_at is not None:
+            # Server-governed window: no refill until it rolls over
+            if now >= self.reset_at:
+                self.tokens = float(self.capacity)
+                self.reset_at = None
+        else:
+            elapsed = now - self.updated_at
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.capacity / self.period)
+        self.updated_at = now
+
+    def _time_until_available(self, cost: float) -> float:
+        if self.reset_at is not None:
+            return self.reset_at - time.time()
+        return (cost - self.tokens) * self.period / self.capacity
+
+    async def acquire(self, cost: float = 1):
+        """Wait until `cost` tokens are available and take them"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    self.acquired += 1
+                    return
+                self.waits += 1
+                await asyncio.sleep(max(self._time_until_available(cost), 0.05))
+
+    def update_from_headers(self, limit: Optional[int], remaining: Optional[int],
+                            reset_at: Optional[float]):
+        """Sync with X-RateLimit-Limit/Remaining/Reset from a response"""
+        if reset_at is None or reset_at <= time.time():
+            return
+        if limit:
+            self.capacity = int(limit)
+        if remaining is not None:
+            self._refill()
+            self.tokens = min(self.tokens, float(remaining))
+        self.reset_at = reset_at
+
+    def get_state(self):
+        """Get current bucket state for monitoring"""
+        self._refill()
+        return {
+            "capacity": self.capacity,
+            "tokens": round(self.tokens, 2),
+            "reset_in": round(self.reset_at - time.time(), 1) if self.reset_at else None,
+            "acquired": self.acquired,
+            "waits": self.waits
+        }
+
+class RateLimiter:
+    """Separate token buckets for read, write and media requests"""
+
+    # Mastodon's defaults: 300 requests per 5 minutes, 30 media uploads per 30 minutes
+    DEFAULT_LIMITS = {
+        'read': (300, 300),
+        'write': (300, 300),
+        'media': (30, 1800)
+    }
+
+    def __init__(self, limits: Optional[Dict[str, tuple]] = None):
+        limits = limits or self.DEFAULT_LIMITS
+        self.buckets = {
+            name: TokenBucket(capacity, period)
+            for name, (capacity, period) in limits.items()
+        }
+
+    async def acquire(self, bucket: str, cost: float = 1):
+        """Take a token from the named bucket, waiting if it is empty"""
+        await self.buckets[bucket].acquire(cost)
+
+    def update_from_headers(self, bucket: str, limit, remaining, reset_at):
+        """Feed rate-limit headers back into the named bucket"""
+        self.buckets[bucket].update_from_headers(limit, remaining, reset_at)
+
+    def get_state(self):
+        """Get the state of every bucket"""
+        return {name: bucket.get_state() for name, bucket in self.buckets.items()}
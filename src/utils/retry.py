@@ -0,0 +1,99 @@
+import asyncio
+import random
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Rate limiting, server errors and timeouts are worth another attempt;
+# anything else (bad request, blocked prompt, auth) fails the same way again
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+RETRY_IN_PATTERN = re.compile(r'retry in ([\d.]+)\s*s', re.IGNORECASE)
+
+def status_code(error: Exception) -> Optional[int]:
+    """HTTP status carried by an API error, if any"""
+    for value in (getattr(error, 'code', None), getattr(error, 'status_code', None),
+                  getattr(getattr(error, 'response', None), 'status_code', None)):
+        if isinstance(value, int):
+            return value
+    return None
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error is transient (429, 5xx, timeout, dropped connection)"""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return status_code(error) in RETRYABLE_STATUS
+
+def _parse_retry_after(value) -> Optional[float]:
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Server-suggested wait in seconds: Retry-After header, RetryInfo detail or message hint"""
+    hint = getattr(error, 'retry_after', None)
+    if hint is None:
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        if headers:
+            hint = headers.get('Retry-After')
+    if hint is not None:
+        return _parse_retry_after(hint)
+    for detail in getattr(error, 'details', None) or ():
+        delay = getattr(detail, 'retry_delay', None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    match = RETRY_IN_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+class RetryPolicy:
+    """Retry budget for one kind of call.
+
+    The first attempt runs immediately. Transient failures are retried with
+    full-jitter exponential backoff (``base_delay * 2**n``, capped at
+    ``max_delay``), or after the server's Retry-After hint when it gives
+    one. A retry that would push the total wait past ``max_total_delay`` is
+    not attempted; non-transient errors are raised at once.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0,
+                 max_delay: float = 30.0, max_total_delay: float = 60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_delay = max_total_delay
+        self.stats = {'calls': 0, 'retries': 0, 'failures': 0, 'waited': 0.0}
+
+    def backoff(self, retry: int, error: Optional[Exception] = None) -> float:
+        """Delay before the given retry (1 for the first retry)"""
+        hint = retry_after(error) if error is not None else None
+        if hint is not None:
+            return hint
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+    async def run(self, make_call, label: str = "call"):
+        """Await make_call(), retrying transient failures within the budget"""
+        self.stats['calls'] += 1
+        waited = 0.0
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return await make_call()
+            except Exception as e:
+                delay = self.backoff(attempt, e) if is_retryable(e) else None
+                if (delay is None or attempt == self.max_attempts
+                        or waited + delay > self.max_total_delay):
+                    self.stats['failures'] += 1
+                    raise
+                print(f"⏳ {label} failed ({str(e)}), retry {attempt}/{self.max_attempts - 1} in {delay:.1f}s...")
+                self.stats['retries'] += 1
+                self.stats['waited'] += delay
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict:
+        """Get retry counters"""
+        return dict(self.stats, waited=round(self.stats['waited'], 1), max_attempts=self.max_attempts)
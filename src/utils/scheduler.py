@@ -0,0 +1,107 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Dict, Optional
+
+class PriorityScheduler:
+    """Shared worker slots handed out by priority class, with aging.
+
+    ``priorities`` maps a work class to its level (0 runs first). Waiting
+    work gains one level per ``aging`` seconds, so a queued low-priority
+    item eventually outranks fresh high-priority work and is never starved.
+    Because every item ages at the same rate, the order is fixed when an
+    item is queued: ``level * aging + enqueue time``.
+    """
+
+    def __init__(self, priorities: Dict[str, int], workers: int = 4, aging: float = 60.0, window: int = 200):
+        self.priorities = priorities
+        self.workers = workers
+        self.aging = aging
+        self.running = 0
+        self._queue = []
+        self._sequence = itertools.count()
+        self._window = window
+        self.stats = {}
+
+    def _class_stats(self, work_class: str) -> Dict:
+        stats = self.stats.get(work_class)
+        if stats is None:
+            stats = self.stats[work_class] = {
+                'submitted': 0, 'completed': 0, 'failed': 0, 'waiting': 0, 'running': 0,
+                'waits': deque(maxlen=self._window)
+            }
+        return stats
+
+    def configure(self, workers: Optional[int] = None, aging: Optional[float] = None):
+        """Change the slot count or aging rate (applies to work queued afterwards)"""
+        if workers:
+            self.workers = workers
+            self._dispatch()
+        if aging:
+            self.aging = aging
+
+    def _dispatch(self):
+        while self._queue and self.running < self.workers:
+            _, _, grant = heapq.heappop(self._queue)
+            if grant.done():  # Waiter was cancelled
+                continue
+            self.running += 1
+            grant.set_result(time.perf_counter())
+
+    async def run(self, work_class: str, make_call):
+        """Await make_call() once a slot is free, ahead of lower-priority work"""
+        stats = self._class_stats(work_class)
+        stats['submitted'] += 1
+        queued = time.perf_counter()
+        level = self.priorities.get(work_class, max(self.priorities.values(), default=0))
+        grant = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (level * self.aging + queued, next(self._sequence), grant))
+        stats['waiting'] += 1
+        try:
+            self._dispatch()
+            started = await grant
+        except asyncio.CancelledError:
+            if grant.done() and not grant.cancelled():
+                # Granted a slot but cancelled before using it
+                self.running -= 1
+                self._dispatch()
+            raise
+        finally:
+            stats['waiting'] -= 1
+        stats['waits'].append(started - queued)
+        stats['running'] += 1
+        try:
+            result = await make_call()
+            stats['completed'] += 1
+            return result
+        except Exception:
+            stats['failed'] += 1
+            raise
+        finally:
+            stats['running'] -= 1
+            self.running -= 1
+            self._dispatch()
+
+    def get_stats(self) -> Dict:
+        """Get per-class queue counters and recent wait-time percentiles"""
+        classes = {}
+        for work_class, stats in self.stats.items():
+            waits = sorted(stats['waits'])
+            def percentile(p):
+                return round(waits[min(int(len(waits) * p), len(waits) - 1)], 3) if waits else None
+            classes[work_class] = dict(
+                {key: value for key, value in stats.items() if key != 'waits'},
+                priority=self.priorities.get(work_class),
+                wait_p50=percentile(0.5),
+                wait_p95=percentile(0.95),
+                wait_max=round(waits[-1], 3) if waits else None
+            )
+        return {
+            'workers': self.workers,
+            'running': self.running,
+            'queued': sum(stats['waiting'] for stats in self.stats.values()),
+            'aging': self.aging,
+            'classes': classes
+        }
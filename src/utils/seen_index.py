@@ -0,0 +1,133 @@
+import hashlib
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+# Mastodon snowflake IDs carry a millisecond timestamp in their upper 48 bits.
+# Anything below this (2017-01-01) is a legacy sequential ID with no timestamp.
+SNOWFLAKE_EPOCH_MS = 1483228800000
+HASHED_ID_FLAG = 1 << 63
+
+def to_key(item_id) -> int:
+    """Map a status ID to an unsigned 64-bit key"""
+    try:
+        return int(item_id)
+    except (TypeError, ValueError):
+        # Non-numeric IDs (e.g. Pleroma flake IDs) are hashed; the top bit
+        # keeps them clear of time-window eviction
+        digest = hashlib.blake2b(str(item_id).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') | HASHED_ID_FLAG
+
+def snowflake_time(key: int):
+    """Unix time encoded in a snowflake ID, or None for legacy/hashed IDs"""
+    timestamp_ms = key >> 16
+    if key & HASHED_ID_FLAG or timestamp_ms < SNOWFLAKE_EPOCH_MS:
+        return None
+    return timestamp_ms / 1000
+
+class SeenIndex:
+    """Compact persistent set of Mastodon status IDs.
+
+    IDs live in a sorted ``array('Q')`` (8 bytes each, O(log n) lookups) plus
+    a small set of IDs added since the last compaction. Every add is appended
+    to the backing file straight away; compaction merges, drops IDs older
+    than ``window_days`` and rewrites the file atomically.
+    """
+
+    def __init__(self, path: str, window_days: float = 30, compact_every: int = 5000):
+        self.path = path
+        self.window = window_days * 86400
+        self.compact_every = compact_every
+        self.ids = array('Q')
+        self.recent = set()
+        self._log = None
+        self.load()
+
+    def load(self):
+        """Load IDs from disk and compact the appended tail"""
+        loaded = array('Q')
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+                # Ignore a torn final write
+                loaded.frombytes(data[:len(data) - len(data) % loaded.itemsize])
+        except Exception as e:
+            print(f"Error loading seen index: {str(e)}")
+        self.ids = array('Q')
+        self.recent = set(loaded)
+        self.compact()
+
+    def __contains__(self, item_id) -> bool:
+        key = to_key(item_id)
+        if key in self.recent:
+            return True
+        position = bisect_left(self.ids, key)
+        return position < len(self.ids) and self.ids[position] == key
+
+    def __len__(self) -> int:
+        return len(self.ids) + len(self.recent)
+
+    def add(self, item_id):
+        """Mark an ID as seen and persist it"""
+        if item_id in self:
+            return
+        key = to_key(item_id)
+        self.recent.add(key)
+        try:
+            if self._log is None:
+                self._log = open(self.path, 'ab')
+            self._log.write(key.to_bytes(8, sys.byteorder))  # Same layout as array.tofile
+            self._log.flush()
+        except Exception as e:
+            print(f"Error persisting seen ID: {str(e)}")
+        if len(self.recent) >= self.compact_every:
+            self.compact()
+
+    def update(self, item_ids):
+        """Mark several IDs as seen"""
+        for item_id in item_ids:
+            self.add(item_id)
+
+    def compact(self):
+        """Merge recent IDs, evict expired ones and rewrite the file"""
+        # Snowflakes sort by time, so expired IDs form one contiguous run
+        cutoff_ms = int((time.time() - self.window) * 1000)
+        start = bisect_left(self.ids, SNOWFLAKE_EPOCH_MS << 16)
+        end = bisect_left(self.ids, max(cutoff_ms, SNOWFLAKE_EPOCH_MS) << 16)
+        kept = self.ids[:start] + self.ids[end:]
+        fresh = [
+            key for key in self.recent
+            if (seen_at := snowflake_time(key)) is None or seen_at * 1000 >= cutoff_ms
+        ]
+        if fresh:
+            # Two sorted runs: timsort merges them in linear time
+            kept = array('Q', sorted(kept + array('Q', sorted(fresh))))
+        try:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                kept.tofile(f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error compacting seen index: {str(e)}")
+        self.ids = kept
+        self.recent = set()
+
+    def get_stats(self):
+        """Get index size"""
+        return {
+            "ids": len(self),
+            "pending_compaction": len(self.recent),
+            "bytes": len(self.ids) * self.ids.itemsize
+        }
+
+    def close(self):
+        """Flush and close the backing file"""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,262 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dm_context (
+    conversation_id TEXT PRIMARY KEY,
+    sender TEXT,
+    last_message_id INTEGER,
+    last_reply_id INTEGER,
+    style TEXT,
+    replied_at REAL
+);
+CREATE TABLE IF NOT EXISTS recent_posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS post_signatures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    signature BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+class StateStore:
+    """Embedded SQLite (WAL) store for the agent's local state.
+
+    Reads are served from in-memory copies loaded at startup, so callers on
+    the event loop never touch the disk. Writes update those copies and
+    queue one small statement each; a background thread commits the queue
+    in a single transaction every ``flush_interval`` seconds. The queue lock
+    is only held to swap the batch out, never during the commit, and the
+    on-demand reads use their own connection, which WAL lets run alongside
+    the writer.
+    """
+
+    def __init__(self, path: str = "agent_state.db", flush_interval: float = 1.0,
+                 recent_posts_limit: int = 50):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.recent_posts_limit = recent_posts_limit
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._read_conn = sqlite3.connect(path, check_same_thread=False)
+
+        self._pending = []
+        self._lock = threading.Lock()  # Guards _pending only
+        self._write_lock = threading.Lock()  # Serializes batches on _conn
+        self._read_lock = threading.Lock()  # Guards _read_conn
+        self._wake = threading.Event()
+        self._closed = False
+        self.writes_flushed = 0
+        self._load()
+
+        self._writer = threading.Thread(target=self._write_loop, name="state-store-writer", daemon=True)
+        self._writer.start()
+
+    def _load(self):
+        cur = self._conn.cursor()
+        self._kv = {key: json.loads(value) for key, value in cur.execute("SELECT key, value FROM kv")}
+        self._cursors = dict(cur.execute("SELECT key, value FROM cursors"))
+        self._counters = dict(cur.execute("SELECT name, value FROM counters"))
+        self._dm_context = {
+            row[0]: {
+                'sender': row[1],
+                'last_message_id': row[2],
+                'last_reply_id': row[3],
+                'style': row[4],
+                'replied_at': row[5]
+            }
+            for row in cur.execute("SELECT * FROM dm_context")
+        }
+        self._recent_posts = [
+            content for (content,) in cur.execute(
+                "SELECT content FROM (SELECT id, content FROM recent_posts ORDER BY id DESC LIMIT ?) ORDER BY id",
+                (self.recent_posts_limit,)
+            )
+        ]
+
+    def _queue(self, sql: str, params: tuple):
+        with self._lock:
+            self._pending.append((sql, params))
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Commit all queued writes in one transaction"""
+        # Taken before the swap so concurrent flushes commit batches in queue order
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                with self._conn:
+                    for sql, params in pending:
+                        self._conn.execute(sql, params)
+                self.writes_flushed += len(pending)
+            except Exception as e:
+                print(f"Error flushing state store: {str(e)}")
+
+    # Key/value settings
+    def get_value(self, key: str, default: Any = None) -> Any:
+        """Get a JSON value by key"""
+        return self._kv.get(key, default)
+
+    def set_value(self, key: str, value: Any):
+        """Set a JSON value by key"""
+        self._kv[key] = value
+        self._queue("INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    # Timeline cursors
+    def get_cursor(self, key: str) -> Optional[int]:
+        """Get the last consumed ID for a timeline"""
+        return self._cursors.get(key)
+
+    def advance_cursor(self, key: str, item_id) -> bool:
+        """Move a timeline cursor forward; older IDs are ignored"""
+        item_id = int(item_id)
+        current = self._cursors.get(key)
+        if current is not None and item_id <= current:
+            return False
+        self._cursors[key] = item_id
+        self._queue("INSERT OR REPLACE INTO cursors (key, value) VALUES (?, ?)", (key, item_id))
+        return True
+
+    # Counters
+    def get_counter(self, name: str, default: float = 0) -> float:
+        """Get a counter value"""
+        return self._counters.get(name, default)
+
+    def set_counter(self, name: str, value: float):
+        """Set a counter value"""
+        self._counters[name] = value
+        self._queue("INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)", (name, value))
+
+    def increment(self, name: str, by: float = 1) -> float:
+        """Add to a counter and return the new value"""
+        self.set_counter(name, self.get_counter(name) + by)
+        return self._counters[name]
+
+    # DM context
+    def get_dm_context(self, conversation_id) -> Optional[Dict]:
+        """Get what we last did in a DM conversation"""
+        return self._dm_context.get(str(conversation_id))
+
+    def record_dm_reply(self, conversation_id, sender: str, message_id, reply_id, style: str):
+        """Record a DM reply"""
+        context = {
+            'sender': sender,
+            'last_message_id': int(message_id),
+            'last_reply_id': int(reply_id),
+            'style': style,
+            'replied_at': time.time()
+        }
+        self._dm_context[str(conversation_id)] = context
+        self._queue(
+            "INSERT OR REPLACE INTO dm_context VALUES (?, ?, ?, ?, ?, ?)",
+            (str(conversation_id), sender, context['last_message_id'],
+             context['last_reply_id'], style, context['replied_at'])
+        )
+
+    # Recent posts
+    def recent_posts(self, limit: Optional[int] = None) -> List[str]:
+        """Get our most recent post texts, oldest first"""
+        if limit is None:
+            return list(self._recent_posts)
+        return self._recent_posts[-limit:]
+
+    def add_recent_post(self, content: str):
+        """Remember a post we published"""
+        self._recent_posts.append(content)
+        del self._recent_posts[:-self.recent_posts_limit]
+        self._queue(
+            "INSERT INTO recent_posts (content, created_at) VALUES (?, ?)",
+            (content, time.time())
+        )
+
+    # Near-duplicate signatures
+    def post_signatures(self) -> List[bytes]:
+        """Get every stored post signature, oldest first"""
+        with self._read_lock:
+            return [
+                signature for (signature,) in
+                self._read_conn.execute("SELECT signature FROM post_signatures ORDER BY id")
+            ]
+
+    def add_post_signature(self, signature: bytes):
+        """Store the signature of a published post"""
+        self._queue(
+            "INSERT INTO post_signatures (signature, created_at) VALUES (?, ?)",
+            (signature, time.time())
+        )
+
+    # LLM response cache (read on demand; it can grow larger than the other tables)
+    def get_llm_response(self, key: str) -> Optional[Tuple[str, float]]:
+        """Get a cached response and its expiry time"""
+        with self._read_lock:
+            return self._read_conn.execute(
+                "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+    def put_llm_response(self, key: str, response: str, expires_at: float):
+        """Store a cached response"""
+        self._queue(
+            "INSERT OR REPLACE INTO llm_cache (key, response, expires_at) VALUES (?, ?, ?)",
+            (key, response, expires_at)
+        )
+
+    def prune_llm_cache(self):
+        """Delete expired cached responses"""
+        self._queue("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+
+    def get_stats(self):
+        """Get store size and write counters"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "path": self.path,
+            "pending_writes": pending,
+            "writes_flushed": self.writes_flushed,
+            "cursors": len(self._cursors),
+            "dm_conversations": len(self._dm_context)
+        }
+
+    def close(self):
+        """Flush outstanding writes and close the database"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
+        self._read_conn.close()
+        self._conn.close()
@@ -0,0 +1,33 @@
+import re
+from typing import List
+
+# Runs of Unicode letters/digits: what NLTK's word_tokenize plus an isalnum()
+# filter kept, without loading the punkt model.
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+# NLTK's English stopword list. Tokens never contain apostrophes, so the
+# contracted forms ("don't", "you're", ...) are left out; their pieces
+# ("don", "t", "re") are listed.
+STOPWORDS = frozenset("""
+i me my myself we our ours ourselves you your yours yourself yourselves he him
+his himself she her hers herself it its itself they them their theirs themselves
+what which who whom this that these those am is are was were be been being have
+has had having do does did doing a an the and but if or because as until while
+of at by for with about against between into through during before after above
+below to from up down in out on off over under again further then once here
+there when where why how all any both each few more most other some such no nor
+not only own same so than too very s t can will just don should now d ll m o re
+ve y ain aren couldn didn doesn hadn hasn haven isn ma mightn mustn needn shan
+shouldn wasn weren won wouldn
+""".split())
+
+def extract_keywords(text: str, limit: int = 5) -> List[str]:
+    """Get the first non-stopword words of a text"""
+    keywords = []
+    for match in WORD_PATTERN.finditer(text.lower()):
+        word = match.group()
+        if word not in STOPWORDS:
+            keywords.append(word)
+            if len(keywords) == limit:
+                break
+    return keywords
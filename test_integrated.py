@@ -1,3 +1,4 @@
+import asyncio
 import os
 from dotenv import load_dotenv
 from src.config.gemini_config import GeminiConfig
@@ -5,7 +6,7 @@ from src.features.thread_generator import ThreadGenerator
 from src.features.research_agent import ResearchAgent
 from src.features.sentiment_analyzer import SentimentAnalyzer
 
-def test_all_features():
+async def test_all_features():
     # Load environment variables
     load_dotenv()
     
@@ -18,12 +19,12 @@ def test_all_features():
     # Test tweet
     test_tweet = "Exploring the future of AI and its impact on society #AI #Future"
     
-    # Test thread generation (synchronous)
+    # Test thread generation
     results = {
-        "thread": thread_gen.generate_thread(test_tweet)
+        "thread": await thread_gen.generate_thread(test_tweet)
     }
     
     return results
 
 if __name__ == "__main__":
-    print(test_all_features()) 
\ No newline at end of file
+    print(asyncio.run(test_all_features())) 
\ No newline at end of file
@@ -0,0 +1,200 @@
+import asyncio
+import os
+import tempfile
+from src.platforms.mastodon import MastodonPlatform
+from src.agent.llm_backend import create_llm_backend
+
+OWN_ID = 1
+
+def make_status(status_id, account_id=7):
+    return {
+        'id': status_id,
+        'content': f'<p>post {status_id} #python</p>',
+        'account': {'id': account_id, 'username': 'bob', 'acct': 'bob'},
+        'created_at': 'now',
+        'media_attachments': []
+    }
+
+class StubApi:
+    """Stands in for AsyncMastodonClient with Mastodon's min_id semantics"""
+
+    def __init__(self, statuses=(), mentions=()):
+        self.statuses = list(statuses)
+        self.mentions = list(mentions)
+
+    async def account_verify_credentials(self):
+        return {'id': OWN_ID}
+
+    async def timeline_hashtag(self, hashtag, min_id=None, limit=20):
+        statuses = sorted(self.statuses, key=lambda s: s['id'])
+        if min_id is None:
+            return list(reversed(statuses[-limit:]))
+        # min_id pages forward from the cursor: the oldest posts after it
+        return list(reversed([s for s in statuses if s['id'] > min_id][:limit]))
+
+    async def notifications(self, types=None, limit=20, min_id=None):
+        mentions = sorted(self.mentions, key=lambda n: n['id'])
+        if min_id is not None:
+            mentions = [n for n in mentions if n['id'] > min_id]
+        return list(reversed(mentions[:limit] if min_id is not None else mentions[-limit:]))
+
+def make_platform(api, failing=()):
+    """Platform on the stub API whose replies fail for the ids in ``failing``"""
+    os.chdir(tempfile.mkdtemp())
+    platform = MastodonPlatform(
+        {'client_id': 'a', 'client_secret': 'b', 'access_token': 'c',
+         'instance_url': 'https://example.social'},
+        llm_backend=create_llm_backend('fake')
+    )
+    platform.api = api
+    platform.cooldown_period = 0
+    platform.failing = set(failing)
+    platform.replied = []
+
+    async def reply(status_id):
+        platform.replied.append(status_id)
+        if status_id in platform.failing:
+            return {"error": "reply failed"}
+        return {"status": "success"}
+
+    async def process_single_post(post):
+        return await reply(post['id'])
+
+    async def handle_mention(status):
+        return await reply(status['id'])
+
+    platform.process_single_post = process_single_post
+    platform.handle_mention = handle_mention
+    return platform
+
+def test_first_poll_advances_after_handling():
+    """The first poll replies oldest first and leaves the cursor on the newest handled post"""
+    async def run():
+        api = StubApi([make_status(i) for i in range(100, 110)])
+        platform = make_platform(api)
+        try:
+            assert await platform._poll_hashtag('python')
+            assert platform.replied == [105, 106, 107, 108, 109]
+            assert platform.state.get_cursor('hashtag:python') == 109
+        finally:
+            platform.close()
+    asyncio.run(run())
+
+def test_first_poll_failure_is_retried():
+    """A failure on the first poll keeps the cursor before the failed post"""
+    async def run():
+        api = StubApi([make_status(i) for i in range(100, 103)])
+        platform = make_platform(api, failing={101})
+        try:
+            assert not await platform._poll_hashtag('python')
+            assert platform.state.get_cursor('hashtag:python') == 100
+            assert 'hashtag:python' in platform.cursor_holds
+
+            platform.failing.clear()
+            platform.replied.clear()
+            assert await platform._poll_hashtag('python')
+            # 102 was already replied to, only the failed post is retried
+            assert platform.replied == [101]
+            assert platform.state.get_cursor('hashtag:python') == 102
+            assert 'hashtag:python' not in platform.cursor_holds
+        finally:
+            platform.close()
+    asyncio.run(run())
+
+def test_poll_gives_up_after_max_attempts():
+    """A post that keeps failing is skipped after max_attempts polls"""
+    async def run():
+        api = StubApi([make_status(100)])
+        platform = make_platform(api)
+        try:
+            await platform._poll_hashtag('python')
+            api.statuses += [make_status(101), make_status(102)]
+            platform.failing.add(101)
+            platform.replied.clear()
+
+            for _ in range(platform.ingestion_settings['max_attempts'] - 1):
+                assert not await platform._poll_hashtag('python')
+                assert platform.state.get_cursor('hashtag:python') == 100
+            assert await platform._poll_hashtag('python')
+            assert platform.state.get_cursor('hashtag:python') == 102
+            assert platform.replied == [101, 102, 101, 101]
+            assert not platform.failed_attempts
+        finally:
+            platform.close()
+    asyncio.run(run())
+
+def test_own_and_seen_posts_move_cursor():
+    """Posts needing no reply only move the cursor while nothing is left before them"""
+    async def run():
+        api = StubApi([make_status(100), make_status(101, account_id=OWN_ID), make_status(102)])
+        platform = make_platform(api)
+        try:
+            platform.seen.add(100)
+            assert await platform._poll_hashtag('python')
+            assert platform.replied == [102]
+            assert platform.state.get_cursor('hashtag:python') == 102
+        finally:
+            platform.close()
+    asyncio.run(run())
+
+def test_mentions_hold_and_advance():
+    """get_mentions keeps the cursor before a failed mention until it succeeds"""
+    async def run():
+        api = StubApi(mentions=[{'id': i, 'status': make_status(i + 1000)} for i in (1, 2, 3)])
+        platform = make_platform(api, failing={1002})
+        try:
+            await platform.get_mentions()
+            assert platform.state.get_cursor('notifications:mention') == 1
+            assert 'notifications:mention' in platform.cursor_holds
+
+            platform.failing.clear()
+            platform.replied.clear()
+            await platform.get_mentions()
+            assert platform.replied == [1002, 1003]
+            assert platform.state.get_cursor('notifications:mention') == 3
+            assert 'notifications:mention' not in platform.cursor_holds
+        finally:
+            platform.close()
+    asyncio.run(run())
+
+def test_hold_cursor_without_cursor():
+    """Holding a cursor that was never set starts it just before the failed item"""
+    async def run():
+        platform = make_platform(StubApi())
+        try:
+            platform._hold_cursor('hashtag:python', 500)
+            assert platform.state.get_cursor('hashtag:python') == 499
+            platform._hold_cursor('hashtag:python', 700)
+            assert platform.state.get_cursor('hashtag:python') == 499
+            assert 'hashtag:python' in platform.cursor_holds
+        finally:
+            platform.close()
+    asyncio.run(run())
+
+def test_streamed_post_catches_up_while_held():
+    """A streamed post arriving while the cursor is held retries the failed post first"""
+    async def run():
+        api = StubApi([make_status(100)])
+        platform = make_platform(api, failing={101})
+        try:
+            await platform._poll_hashtag('python')
+            api.statuses.append(make_status(101))
+            await platform._on_hashtag_event('python', 'update', make_status(101))
+            assert platform.state.get_cursor('hashtag:python') == 100
+            assert 'hashtag:python' in platform.cursor_holds
+
+            platform.failing.clear()
+            api.statuses.append(make_status(102))
+            await platform._on_hashtag_event('python', 'update', make_status(102))
+            assert platform.replied == [100, 101, 101, 102]
+            assert platform.state.get_cursor('hashtag:python') == 102
+            assert 'hashtag:python' not in platform.cursor_holds
+        finally:
+            platform.close()
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✅ {name}")
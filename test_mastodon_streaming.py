@@ -0,0 +1,72 @@
+import asyncio
+import json
+from aiohttp import web
+from src.listener.mastodon_stream import MastodonStreamListener, StreamUnavailable
+
+def sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode()
+
+async def start_fake_streaming_server(fail_after=1):
+    """Local SSE server mimicking Mastodon's /api/v1/streaming endpoints"""
+    state = {'connections': 0, 'auth': None, 'tag': None}
+
+    async def hashtag_stream(request):
+        state['connections'] += 1
+        state['auth'] = request.headers.get('Authorization')
+        state['tag'] = request.query.get('tag')
+        if state['connections'] > fail_after:
+            return web.Response(status=503)
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        await response.write(b":thump\n\n")
+        await response.write(sse('update', {
+            'id': '109876543210987654',
+            'content': '<p>Hello <a href="#">#python</a></p>',
+            'account': {'id': '42', 'username': 'alice'}
+        }))
+        await response.write(b"event: delete\ndata: 109876543210987650\n\n")
+        return response
+
+    app = web.Application()
+    app.router.add_get('/api/v1/streaming/hashtag', hashtag_stream)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", state
+
+async def test_mastodon_streaming():
+    """Stream events from a fake server, then fall back after repeated failures"""
+    runner, url, state = await start_fake_streaming_server(fail_after=1)
+    events = []
+
+    async def on_event(event_type, payload):
+        events.append((event_type, payload))
+
+    listener = MastodonStreamListener(
+        url, 'test-token', on_event,
+        max_failures=3, backoff_base=0.01, backoff_max=0.05
+    )
+    try:
+        await asyncio.wait_for(listener.run('hashtag', {'tag': 'python'}), timeout=10)
+        raise AssertionError("Listener should have given up on the failing stream")
+    except StreamUnavailable as e:
+        print(f"Fell back as expected: {str(e)}")
+    finally:
+        await runner.cleanup()
+
+    assert state['auth'] == 'Bearer test-token'
+    assert state['tag'] == 'python'
+    assert [event for event, _ in events] == ['update', 'delete']
+    status = events[0][1]
+    assert status['id'] == 109876543210987654
+    assert status['account']['id'] == 42
+    assert events[1][1] == 109876543210987650
+    assert state['connections'] == 4  # 1 good connection + 3 failed reconnects
+    print(f"Stream stats: {listener.get_stats()}")
+    print("\n✅ Streaming test completed!")
+
+if __name__ == "__main__":
+    asyncio.run(test_mastodon_streaming())
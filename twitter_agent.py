@@ -1,11 +1,14 @@
 import asyncio
 import os
 import tweepy
-import google.generativeai as genai
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import time
 from typing import Optional, List
+from src.agent.llm_backend import create_llm_backend
+from src.agent.llm_client import AsyncLLMClient
+from src.agent.token_meter import get_token_meter
+from src.utils.state_store import StateStore
 
 # Load environment variables
 load_dotenv()
@@ -19,7 +22,6 @@ TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN')
 
 # Gemini API Key
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-genai.configure(api_key=GEMINI_API_KEY)
 
 class TwitterAIAgent:
     def __init__(self):
@@ -51,7 +53,18 @@ class TwitterAIAgent:
             print(f"Authentication Error: {str(e)}")
             raise
 
-        self.model = genai.GenerativeModel('gemini-1.5-pro')
+        # LLM_BACKEND=fake swaps in the offline backend
+        self.llm_backend = create_llm_backend()
+        self.llm_backend.configure(api_key=GEMINI_API_KEY)
+        self.model = self.llm_backend.create_model('gemini-1.5-pro')
+        # Token usage persists across runs in the agent's state store
+        self.state = StateStore('twitter_agent_state.db')
+        self.token_meter = get_token_meter(self.state)
+        self.token_meter.budgets.update({
+            'analysis': {'hourly': 20000, 'daily': 100000, 'priority': 'low'},
+            'replies': {'hourly': 40000, 'daily': 300000, 'priority': 'high'}
+        })
+        self.llm = AsyncLLMClient(self.model, meter=self.token_meter)
         self.request_count = 0
         self.last_request_time = time.time()
         self.monthly_tweet_limit = 50000
@@ -157,7 +170,7 @@ class TwitterAIAgent:
         4. Suggested response (if appropriate)
         """
         
-        response = self.model.generate_content(prompt)
+        response = await self.llm.generate(prompt, service='analysis')
         return response.text
 
     async def generate_entertainment_response(self, tweet_text):
@@ -181,7 +194,7 @@ class TwitterAIAgent:
         🎪 Entertainment Value: [rating out of 10]
         """
         
-        response = self.model.generate_content(prompt)
+        response = await self.llm.generate(prompt, service='replies')
         return response.text
 
     async def reply_to_tweet(self, tweet_id, reply_text):